@@ -0,0 +1,101 @@
+"""Сравнение страниц только для чтения под uvicorn (ASGI) и gunicorn (WSGI).
+
+Запуск из каталога blogicum/ при заполненной базе:
+
+    python -m benchmarks.asgi_vs_wsgi --requests 5000 --concurrency 32
+"""
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from .http_load import format_rows, run_load
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+SERVERS = {
+    "asgi": [
+        sys.executable, "-m", "uvicorn", "blogicum.asgi:application",
+        "--host", "127.0.0.1", "--port", "{port}",
+        "--workers", "{workers}", "--log-level", "warning",
+    ],
+    "wsgi": [
+        sys.executable, "-m", "gunicorn", "blogicum.wsgi:application",
+        "--bind", "127.0.0.1:{port}", "--workers", "{workers}",
+        "--threads", "{threads}", "--log-level", "warning",
+    ],
+}
+
+DEFAULT_PATHS = ["/", "/pages/about/", "/pages/rules/"]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Сервер на порту {port} не запустился.")
+
+
+def bench_server(name, options, paths):
+    port = free_port()
+    command = [
+        part.format(
+            port=port, workers=options.workers, threads=options.threads
+        )
+        for part in SERVERS[name]
+    ]
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=options.settings)
+    server = subprocess.Popen(command, cwd=PROJECT_DIR, env=env)
+    try:
+        wait_for_port(port)
+        base_url = f"http://127.0.0.1:{port}"
+        targets = [(path, path, 1) for path in paths]
+        run_load(base_url, targets, options.warmup, options.concurrency)
+        return run_load(
+            base_url, targets, options.requests, options.concurrency
+        )
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--settings", default="blogicum.settings")
+    parser.add_argument(
+        "--path", action="append", dest="paths",
+        help="Путь для нагрузки; можно указать несколько раз.",
+    )
+    parser.add_argument(
+        "--server", action="append", choices=sorted(SERVERS), dest="servers"
+    )
+    options = parser.parse_args(argv)
+    paths = options.paths or DEFAULT_PATHS
+    for name in options.servers or sorted(SERVERS):
+        result = bench_server(name, options, paths)
+        print(format_rows(
+            result.rows(),
+            title=f"\n{name}: {result.total / result.elapsed:.1f} req/s",
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import http.client
+import random
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class LoadResult:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.elapsed = 0.0
+
+    @property
+    def total(self):
+        return sum(len(values) for values in self.latencies.values())
+
+    def rows(self):
+        for label in sorted(self.latencies):
+            values = self.latencies[label]
+            yield {
+                "label": label,
+                "requests": len(values),
+                "errors": self.errors[label],
+                "rps": len(values) / self.elapsed if self.elapsed else 0.0,
+                "p50": percentile(values, 50) * 1000,
+                "p95": percentile(values, 95) * 1000,
+                "p99": percentile(values, 99) * 1000,
+            }
+
+
+def format_rows(rows, title=""):
+    lines = [title] if title else []
+    lines.append(
+        f"{'view':<32} {'reqs':>7} {'err':>5} {'rps':>9} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    )
+    for row in rows:
+        lines.append(
+            f"{row['label']:<32} {row['requests']:>7} {row['errors']:>5} "
+            f"{row['rps']:>9.1f} {row['p50']:>8.2f} {row['p95']:>8.2f} "
+            f"{row['p99']:>8.2f}"
+        )
+    return "\n".join(lines)
+
+
+def run_load(base_url, targets, total, concurrency, timeout=30, seed=None):
+    """Выполняет total GET-запросов в concurrency потоков.
+
+    targets — список кортежей (метка, путь, вес); путь выбирается случайно
+    с учётом веса, задержки группируются по метке.
+    """
+    parts = urlsplit(base_url)
+    labels, paths, weights = zip(*targets)
+    result = LoadResult()
+    lock = threading.Lock()
+    remaining = [total]
+    rng = random.Random(seed)
+    choices = rng.choices(range(len(paths)), weights=weights, k=total)
+
+    def worker():
+        connection = http.client.HTTPConnection(
+            parts.hostname, parts.port, timeout=timeout
+        )
+        while True:
+            with lock:
+                if not remaining[0]:
+                    break
+                remaining[0] -= 1
+                index = choices[remaining[0]]
+            started = time.perf_counter()
+            try:
+                connection.request("GET", paths[index])
+                response = connection.getresponse()
+                response.read()
+                failed = response.status >= 500
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                failed = True
+            latency = time.perf_counter() - started
+            with lock:
+                result.latencies[labels[index]].append(latency)
+                if failed:
+                    result.errors[labels[index]] += 1
+        connection.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    result.elapsed = time.perf_counter() - started
+    return result
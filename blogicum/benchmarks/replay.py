@@ -0,0 +1,112 @@
+"""Нагрузка на запущенный сервер смесью запросов, близкой к реальной.
+
+Адреса выбираются из базы с тем же перекосом, что у читателей: популярные
+посты, активные авторы и первые страницы лент запрашиваются чаще.
+
+    python manage.py generate_data --posts 1000000 --comments 5000000
+    python -m benchmarks.replay --base-url http://127.0.0.1:8000
+"""
+import argparse
+import os
+import random
+
+from .http_load import format_rows, run_load
+
+# Доли видов запросов в смеси: (метка, вес).
+TRAFFIC_MIX = (
+    ("blog:index", 35),
+    ("blog:index?page", 5),
+    ("blog:post_detail", 35),
+    ("blog:category_posts", 12),
+    ("blog:profile", 10),
+    ("pages:about", 2),
+    ("pages:rules", 1),
+)
+
+
+def build_pool(size, rng):
+    import django
+
+    django.setup()
+    from django.urls import reverse
+
+    from django.conf import settings
+
+    from blog.models import Post
+    from blog.views import get_published_posts
+
+    published = get_published_posts(Post.objects).order_by("-pub_date")
+    post_ids = list(published.values_list("pk", flat=True)[:10_000])
+    slugs = list(
+        published.values_list("category__slug", flat=True).distinct()[:1000]
+    )
+    usernames = list(
+        published.values_list("author__username", flat=True).distinct()[
+            :10_000
+        ]
+    )
+    pages = max(1, published.count() // settings.PAGINATOR_MAIN_PAGE)
+
+    def skewed(items):
+        # Начало списка (свежие записи) запрашивается чаще остальных.
+        return items[min(int(rng.paretovariate(1.2)) - 1, len(items) - 1)]
+
+    def page():
+        return min(int(rng.paretovariate(1.5)), pages)
+
+    builders = {
+        "blog:index": lambda: reverse("blog:index"),
+        "blog:index?page": lambda: f"{reverse('blog:index')}?page={page()}",
+        "blog:post_detail": lambda: reverse(
+            "blog:post_detail", args=[skewed(post_ids)]
+        ),
+        "blog:category_posts": lambda: reverse(
+            "blog:category_posts", args=[skewed(slugs)]
+        ),
+        "blog:profile": lambda: reverse(
+            "blog:profile", args=[skewed(usernames)]
+        ),
+        "pages:about": lambda: reverse("pages:about"),
+        "pages:rules": lambda: reverse("pages:rules"),
+    }
+    available = {
+        "blog:post_detail": post_ids,
+        "blog:category_posts": slugs,
+        "blog:profile": usernames,
+    }
+    mix = [
+        (label, weight) for label, weight in TRAFFIC_MIX
+        if available.get(label, True)
+    ]
+    labels = rng.choices(
+        [label for label, _ in mix], weights=[w for _, w in mix], k=size
+    )
+    return [(label, builders[label](), 1) for label in labels]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--requests", type=int, default=10_000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--pool", type=int, default=5000,
+                        help="Число различных адресов в смеси.")
+    parser.add_argument("--seed", type=int, default=None)
+    options = parser.parse_args(argv)
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "blogicum.settings")
+
+    rng = random.Random(options.seed)
+    targets = build_pool(options.pool, rng)
+    result = run_load(
+        options.base_url, targets, options.requests, options.concurrency,
+        seed=options.seed,
+    )
+    print(format_rows(
+        result.rows(),
+        title=f"{result.total / result.elapsed:.1f} req/s, "
+              f"{sum(result.errors.values())} ошибок",
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Задержка первого запроса после старта процесса: без прогрева и с ним.
+
+Каждый замер выполняется в новом процессе. Для настроек по умолчанию
+(blogicum.settings_production) нужна собранная статика и база:
+
+    python manage.py collectstatic --settings=blogicum.settings_production
+    python -m benchmarks.template_warmup --repeat 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+DEFAULT_PATHS = ["/", "/pages/about/", "/auth/login/"]
+
+
+def child(paths, warm):
+    import django
+
+    django.setup()
+    from django.conf import settings
+    from django.test import Client
+
+    from blogicum.warmup import warm_templates
+
+    warmup_ms = 0.0
+    if warm:
+        started = time.perf_counter()
+        warm_templates()
+        warmup_ms = (time.perf_counter() - started) * 1000
+    client = Client(HTTP_HOST=settings.ALLOWED_HOSTS[0])
+    timings = {}
+    for path in paths:
+        started = time.perf_counter()
+        client.get(path)
+        first = time.perf_counter() - started
+        started = time.perf_counter()
+        client.get(path)
+        second = time.perf_counter() - started
+        timings[path] = (first * 1000, second * 1000)
+    print(json.dumps({"warmup_ms": warmup_ms, "timings": timings}))
+
+
+def run_child(options, warm):
+    command = [sys.executable, "-m", "benchmarks.template_warmup", "--child"]
+    if warm:
+        command.append("--warm")
+    for path in options.paths or DEFAULT_PATHS:
+        command += ["--path", path]
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=options.settings)
+    output = subprocess.run(
+        command, cwd=PROJECT_DIR, env=env, check=True,
+        capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--settings", default="blogicum.settings_production")
+    parser.add_argument("--path", action="append", dest="paths")
+    parser.add_argument("--child", action="store_true",
+                        help=argparse.SUPPRESS)
+    parser.add_argument("--warm", action="store_true", help=argparse.SUPPRESS)
+    options = parser.parse_args(argv)
+    if options.child:
+        child(options.paths or DEFAULT_PATHS, options.warm)
+        return
+
+    for warm in (False, True):
+        runs = [run_child(options, warm) for _ in range(options.repeat)]
+        title = "с прогревом" if warm else "без прогрева"
+        warmup = statistics.median(run["warmup_ms"] for run in runs)
+        print(f"\n{title} (прогрев {warmup:.1f} мс, медиана {options.repeat}"
+              " запусков)")
+        print(f"{'path':<24} {'first ms':>10} {'second ms':>10}")
+        for path in runs[0]["timings"]:
+            first = statistics.median(run["timings"][path][0] for run in runs)
+            second = statistics.median(
+                run["timings"][path][1] for run in runs
+            )
+            print(f"{path:<24} {first:>10.2f} {second:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
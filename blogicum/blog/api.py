@@ -0,0 +1,250 @@
+"""JSON API только для чтения: /api/v1/.
+
+Видимость та же, что у HTML-страниц (get_published_posts,
+get_profile_posts, get_post_for_user). Списки листаются курсором по
+(pub_date, pk) без OFFSET; ?fields=id,title оставляет в ответе только
+нужные поля. Ответы анонимам кэшируются до изменения данных.
+"""
+import base64
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import BadRequest
+from django.db.models import Q
+from django.http import Http404, HttpResponse, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+from django.utils.dateparse import parse_datetime
+from django.views.decorators.http import require_GET
+
+from .cache import get_version
+from .models import Category, Post
+from .views import (
+    get_post_for_user,
+    get_profile_posts,
+    get_published_category,
+    get_published_posts,
+)
+
+User = get_user_model()
+
+API_VERSION = "api"
+
+
+POST_FIELDS = {
+    "id": lambda post: post.pk,
+    "title": lambda post: post.title,
+    "text": lambda post: post.text,
+    "pub_date": lambda post: post.pub_date,
+    "author": lambda post: post.author.username,
+    "category": lambda post: post.category.slug if post.category else None,
+    "location": lambda post: post.location.name if post.location else None,
+    "image": lambda post: post.image.url if post.image else None,
+    "comment_count": lambda post: post.comment_count,
+    "url": lambda post: reverse("blog:post_detail", args=[post.pk]),
+}
+
+COMMENT_FIELDS = {
+    "id": lambda comment: comment.pk,
+    "author": lambda comment: comment.author.username,
+    "text": lambda comment: comment.text,
+    "created_at": lambda comment: comment.created_at,
+}
+
+CATEGORY_FIELDS = {
+    "slug": lambda category: category.slug,
+    "title": lambda category: category.title,
+    "description": lambda category: category.description,
+}
+
+PROFILE_FIELDS = {
+    "username": lambda user: user.username,
+    "first_name": lambda user: user.first_name,
+    "last_name": lambda user: user.last_name,
+    "date_joined": lambda user: user.date_joined,
+}
+
+
+def selected_fields(request, fields):
+    names = request.GET.get("fields")
+    if not names:
+        return fields
+    names = names.split(",")
+    unknown = set(names) - set(fields)
+    if unknown:
+        raise BadRequest(f"Неизвестные поля: {', '.join(sorted(unknown))}.")
+    return {name: fields[name] for name in names}
+
+
+def serialize(obj, fields):
+    return {name: getter(obj) for name, getter in fields.items()}
+
+
+def page_size(request):
+    try:
+        limit = int(request.GET.get("limit", settings.API_PAGE_SIZE))
+    except ValueError:
+        raise BadRequest("limit должен быть числом.")
+    return max(1, min(limit, settings.API_MAX_PAGE_SIZE))
+
+
+def encode_cursor(*values):
+    raw = "|".join(str(value) for value in values)
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(request):
+    cursor = request.GET.get("cursor")
+    if not cursor:
+        return None
+    try:
+        ordered, pk = base64.urlsafe_b64decode(cursor).decode().split("|")
+        return ordered, int(pk)
+    except ValueError:
+        raise BadRequest("Некорректный курсор.")
+
+
+def next_url(request, cursor):
+    query = request.GET.copy()
+    query["cursor"] = cursor
+    return f"{request.path}?{query.urlencode()}"
+
+
+def paginate(request, queryset, field, descending, fields):
+    """Страница по ключу (field, pk) и ссылка на следующую."""
+    limit = page_size(request)
+    cursor = decode_cursor(request)
+    if cursor is not None:
+        value, pk = cursor
+        if field != "pk":
+            value = parse_datetime(value)
+            if value is None:
+                raise BadRequest("Некорректный курсор.")
+            after = "lt" if descending else "gt"
+            queryset = queryset.filter(
+                Q(**{f"{field}__{after}": value})
+                | Q(**{field: value, f"pk__{after}": pk})
+            )
+        else:
+            queryset = queryset.filter(
+                **{"pk__lt" if descending else "pk__gt": pk}
+            )
+    prefix = "-" if descending else ""
+    ordering = [f"{prefix}{field}", f"{prefix}pk"] if field != "pk" else [
+        f"{prefix}pk"
+    ]
+    items = list(queryset.order_by(*ordering)[:limit + 1])
+    has_next = len(items) > limit
+    items = items[:limit]
+    next_cursor = None
+    if has_next:
+        last = items[-1]
+        next_cursor = encode_cursor(
+            getattr(last, field).isoformat() if field != "pk" else last.pk,
+            last.pk,
+        )
+    return {
+        "results": [serialize(item, fields) for item in items],
+        "next": next_url(request, next_cursor) if next_cursor else None,
+    }
+
+
+def api_view(view):
+    """GET, ответы в JSON, кэш для анонимов, ETag и 304."""
+    @require_GET
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        anonymous = not request.user.is_authenticated
+        key = "blog:api:{}:{}".format(
+            get_version(API_VERSION),
+            hashlib.md5(request.get_full_path().encode()).hexdigest(),
+        )
+        cached = cache.get(key) if anonymous else None
+        if cached is None:
+            try:
+                response = JsonResponse(
+                    view(request, *args, **kwargs),
+                    json_dumps_params={"ensure_ascii": False},
+                )
+            except BadRequest as error:
+                return JsonResponse({"detail": str(error)}, status=400)
+            except Http404 as error:
+                return JsonResponse(
+                    {"detail": str(error) or "Не найдено."}, status=404
+                )
+            cached = (
+                response.content,
+                f'"{hashlib.md5(response.content).hexdigest()}"',
+            )
+            if anonymous:
+                cache.set(key, cached, settings.API_CACHE_SECONDS)
+        content, etag = cached
+        response = HttpResponse(content, content_type="application/json")
+        response["ETag"] = etag
+        patch_vary_headers(response, ("Cookie",))
+        if anonymous:
+            patch_cache_control(
+                response, public=True, max_age=settings.API_CACHE_SECONDS
+            )
+        else:
+            patch_cache_control(response, private=True, max_age=0)
+        return get_conditional_response(request, etag=etag, response=response)
+
+    return wrapper
+
+
+@api_view
+def post_list(request):
+    fields = selected_fields(request, POST_FIELDS)
+    posts = get_published_posts(Post.objects)
+    if "author" in request.GET:
+        author = get_object_or_404(User, username=request.GET["author"])
+        posts = get_profile_posts(author, request.user)
+    if "category" in request.GET:
+        category = get_published_category(request.GET["category"])
+        posts = posts.filter(category=category)
+    return paginate(request, posts, "pub_date", True, fields)
+
+
+@api_view
+def post_detail(request, post_id):
+    fields = selected_fields(request, POST_FIELDS)
+    post = get_post_for_user(post_id, request.user)
+    if "comment_count" in fields:
+        post.comment_count = post.comments.count()
+    return serialize(post, fields)
+
+
+@api_view
+def comment_list(request, post_id):
+    fields = selected_fields(request, COMMENT_FIELDS)
+    post = get_post_for_user(post_id, request.user)
+    comments = post.comments.select_related("author")
+    return paginate(request, comments, "created_at", False, fields)
+
+
+@api_view
+def category_list(request):
+    fields = selected_fields(request, CATEGORY_FIELDS)
+    categories = Category.objects.filter(is_published=True)
+    return paginate(request, categories, "pk", False, fields)
+
+
+@api_view
+def category_detail(request, category_slug):
+    fields = selected_fields(request, CATEGORY_FIELDS)
+    return serialize(get_published_category(category_slug), fields)
+
+
+@api_view
+def profile_detail(request, username):
+    fields = selected_fields(request, PROFILE_FIELDS)
+    return serialize(get_object_or_404(User, username=username), fields)
@@ -0,0 +1,26 @@
+from django.urls import path
+
+from . import api
+
+app_name = "api"
+
+urlpatterns = [
+    path("posts/", api.post_list, name="post_list"),
+    path("posts/<int:post_id>/", api.post_detail, name="post_detail"),
+    path(
+        "posts/<int:post_id>/comments/",
+        api.comment_list,
+        name="comment_list",
+    ),
+    path("categories/", api.category_list, name="category_list"),
+    path(
+        "categories/<slug:category_slug>/",
+        api.category_detail,
+        name="category_detail",
+    ),
+    path(
+        "profiles/<str:username>/",
+        api.profile_detail,
+        name="profile_detail",
+    ),
+]
@@ -0,0 +1,111 @@
+"""Архив по месяцам: MonthlyPostCount.
+
+Навигация по архиву и боковая панель читают готовые счётчики вместо
+GROUP BY по всем постам, а страница месяца выбирает посты по индексу
+(is_visible, pub_date) в границах месяца. Счётчики пересчитываются для
+затронутых месяцев при сохранении и удалении поста и по сигналу
+post_published; смена публикации категории и массовые загрузки
+пересобирают таблицу целиком (rebuild_archive).
+"""
+from datetime import date, datetime
+
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from .models import MonthlyPostCount, Post
+
+
+def month_of(moment):
+    local = timezone.localtime(moment)
+    return local.year, local.month
+
+
+def month_bounds(year, month):
+    start = timezone.make_aware(datetime(year, month, 1))
+    year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return start, timezone.make_aware(datetime(year, month, 1))
+
+
+def published_in(year, month):
+    start, end = month_bounds(year, month)
+    return Post.objects.filter(
+        is_visible=True,
+        pub_date__gte=start,
+        pub_date__lt=end,
+        pub_date__lte=timezone.now(),
+    )
+
+
+def store(year, month, category_id, count):
+    buckets = MonthlyPostCount.objects.filter(
+        year=year, month=month, category_id=category_id
+    )
+    if not count:
+        buckets.delete()
+    elif not buckets.update(count=count):
+        MonthlyPostCount.objects.create(
+            year=year, month=month, category_id=category_id, count=count
+        )
+
+
+def refresh(months, category_ids):
+    """Пересчитывает итоги месяцев и строки указанных категорий."""
+    with transaction.atomic():
+        for year, month in set(months):
+            posts = published_in(year, month)
+            store(year, month, None, posts.count())
+            for category_id in set(category_ids) - {None}:
+                store(
+                    year, month, category_id,
+                    posts.filter(category_id=category_id).count(),
+                )
+
+
+def rebuild():
+    rows = (
+        Post.objects.filter(is_visible=True, pub_date__lte=timezone.now())
+        .annotate(month_start=TruncMonth("pub_date"))
+        .order_by()
+        .values("month_start", "category_id")
+        .annotate(count=Count("pk"))
+        .values_list("month_start", "category_id", "count")
+    )
+    buckets = {}
+    for month_start, category_id, count in rows:
+        key = (month_start.year, month_start.month)
+        buckets[key + (category_id,)] = count
+        buckets[key + (None,)] = buckets.get(key + (None,), 0) + count
+    with transaction.atomic():
+        MonthlyPostCount.objects.all().delete()
+        MonthlyPostCount.objects.bulk_create(
+            MonthlyPostCount(
+                year=year, month=month, category_id=category_id, count=count
+            )
+            for (year, month, category_id), count in buckets.items()
+        )
+
+
+def months(category=None, year=None):
+    """[(первое число месяца, число постов)] от новых к старым."""
+    # category=None — итоги месяцев (category IS NULL).
+    buckets = MonthlyPostCount.objects.filter(category=category)
+    if year is not None:
+        buckets = buckets.filter(year=year)
+    return [
+        (date(year, month, 1), count)
+        for year, month, count in buckets.order_by(
+            "-year", "-month"
+        ).values_list("year", "month", "count")
+    ]
+
+
+def month_count(year, month, category=None):
+    return (
+        MonthlyPostCount.objects.filter(
+            year=year, month=month, category=category
+        )
+        .values_list("count", flat=True)
+        .first()
+    ) or 0
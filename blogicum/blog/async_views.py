@@ -0,0 +1,110 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.shortcuts import get_object_or_404
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+from django.utils.http import http_date, quote_etag
+
+from blogicum.asyncutils import paginate, render_async
+from . import archive, comment_queue
+from .form import CommentForm
+from .models import Post
+from .views import (
+    User,
+    get_post_detail_validators,
+    get_post_for_user,
+    get_profile_posts,
+    get_published_category,
+    get_published_posts,
+)
+
+
+@sync_to_async
+def _post_list_context(request):
+    context = paginate(
+        get_published_posts(Post.objects),
+        request,
+        settings.PAGINATOR_MAIN_PAGE,
+    )
+    context["archive"] = archive.months()
+    return context
+
+
+@sync_to_async
+def _category_context(request, category_slug):
+    category = get_published_category(category_slug)
+    context = paginate(
+        get_published_posts(category.posts),
+        request,
+        settings.PAGINATOR_CATEGORY_PAGE,
+    )
+    context["category"] = category
+    context["archive"] = archive.months(category)
+    return context
+
+
+@sync_to_async
+def _profile_context(request, username):
+    profile = get_object_or_404(
+        User.objects.select_related("stats"), username=username
+    )
+    context = paginate(
+        get_profile_posts(profile, request.user),
+        request,
+        settings.PAGINATOR_PROFILE,
+    )
+    context["profile"] = profile
+    return context
+
+
+@sync_to_async
+def _post_detail_context(request, post_id):
+    post = get_post_for_user(post_id, request.user)
+    return {
+        "post": post,
+        "comments": [
+            *post.comments.select_related("author"),
+            *comment_queue.pending_for(request, post),
+        ],
+        "form": CommentForm(request.POST),
+    }
+
+
+async def post_list(request):
+    context = await _post_list_context(request)
+    return await render_async(request, "blog/index.html", context)
+
+
+async def category_posts(request, category_slug):
+    context = await _category_context(request, category_slug)
+    return await render_async(request, "blog/category.html", context)
+
+
+async def profile(request, username):
+    context = await _profile_context(request, username)
+    return await render_async(request, "blog/profile.html", context)
+
+
+async def post_detail(request, post_id):
+    etag, last_modified = await sync_to_async(get_post_detail_validators)(
+        request, post_id
+    )
+    etag = quote_etag(etag) if etag else None
+    last_modified = last_modified and int(last_modified.timestamp())
+    if etag and request.method in ("GET", "HEAD"):
+        not_modified = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if not_modified is not None:
+            return not_modified
+    context = await _post_detail_context(request, post_id)
+    response = await render_async(request, "blog/detail.html", context)
+    if etag:
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ("Cookie",))
+    return response
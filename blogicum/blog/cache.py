@@ -0,0 +1,33 @@
+"""Версионированный кэш производных представлений ленты.
+
+Вместо поиска и удаления всех затронутых ключей при изменении данных
+увеличивается номер версии: старые записи просто перестают читаться и
+вытесняются кэшем по времени жизни.
+"""
+from django.core.cache import cache
+
+FEED_VERSION = "feed"
+
+
+def get_version(name):
+    return cache.get_or_set(f"blog:version:{name}", 1, None)
+
+
+def bump_version(name):
+    key = f"blog:version:{name}"
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 2, None)
+
+
+def get_feed_version():
+    return get_version(FEED_VERSION)
+
+
+def bump_feed_version():
+    bump_version(FEED_VERSION)
+
+
+def feed_key(*parts):
+    return ":".join(["blog", str(get_feed_version()), *map(str, parts)])
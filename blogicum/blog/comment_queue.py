@@ -0,0 +1,162 @@
+"""Буферизованный приём комментариев (COMMENT_BUFFERING).
+
+comment_create дописывает комментарий строкой JSON в файл очереди
+COMMENT_SPOOL_DIR/pending.jsonl (с fsync — запись переживает падение
+процесса), а flush_comments пачками переносит очередь в базу через
+bulk_create. Пока комментарий в очереди, автор видит его на странице
+поста: ссылки на свои неразобранные комментарии хранятся в сессии
+не дольше COMMENT_PENDING_MAX_AGE — так из неё уходят и записи, которые
+обработчик отбросил (например, пост успели удалить).
+
+Файл переименовывается обработчиком целиком; писатель под flock
+проверяет, что дописывает всё ещё актуальный файл, поэтому строки
+не теряются между переименованием и чтением.
+"""
+import fcntl
+import json
+import os
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Comment
+
+SESSION_KEY = "blog_pending_comments"
+
+
+def spool_dir():
+    path = Path(settings.COMMENT_SPOOL_DIR)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def pending_path():
+    return spool_dir() / "pending.jsonl"
+
+
+def append(record):
+    line = (json.dumps(record, ensure_ascii=False) + "\n").encode()
+    path = pending_path()
+    while True:
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                current = os.stat(path)
+            except FileNotFoundError:
+                current = None
+            opened = os.fstat(fd)
+            if current and (current.st_dev, current.st_ino) == (
+                opened.st_dev, opened.st_ino
+            ):
+                os.write(fd, line)
+                os.fsync(fd)
+                return
+        finally:
+            os.close(fd)
+
+
+def enqueue(request, post, text):
+    record = {
+        "post_id": post.pk,
+        "author_id": request.user.pk,
+        "text": text,
+        "created_at": timezone.now().isoformat(),
+    }
+    append(record)
+    request.session[SESSION_KEY] = [
+        *fresh_entries(request.session),
+        {key: record[key] for key in ("post_id", "text", "created_at")},
+    ]
+    return record
+
+
+def fresh_entries(session):
+    """Записи сессии моложе COMMENT_PENDING_MAX_AGE; старые удаляет."""
+    entries = session.get(SESSION_KEY, [])
+    oldest = timezone.now() - timedelta(
+        seconds=settings.COMMENT_PENDING_MAX_AGE
+    )
+    fresh = [
+        entry for entry in entries
+        if parse_datetime(entry["created_at"]) >= oldest
+    ]
+    if len(fresh) < len(entries):
+        session[SESSION_KEY] = fresh
+    return fresh
+
+
+def session_entries(request, post_id):
+    session = getattr(request, "session", None)
+    if session is None or not request.user.is_authenticated:
+        return []
+    return [
+        entry for entry in fresh_entries(session)
+        if entry["post_id"] == post_id
+    ]
+
+
+def pending_for(request, post):
+    """Неразобранные комментарии автора к посту: чтение своих записей."""
+    entries = session_entries(request, post.pk)
+    if not entries:
+        return []
+    stored = set(
+        Comment.objects.filter(
+            post_id=post.pk,
+            author_id=request.user.pk,
+            created_at__in=[
+                parse_datetime(entry["created_at"]) for entry in entries
+            ],
+        ).values_list("created_at", flat=True)
+    )
+    waiting = [
+        entry for entry in entries
+        if parse_datetime(entry["created_at"]) not in stored
+    ]
+    if len(waiting) < len(entries):
+        request.session[SESSION_KEY] = [
+            entry for entry in request.session[SESSION_KEY]
+            if entry["post_id"] != post.pk or entry in waiting
+        ]
+    return [
+        Comment(
+            post=post,
+            author=request.user,
+            text=entry["text"],
+            created_at=parse_datetime(entry["created_at"]),
+        )
+        for entry in waiting
+    ]
+
+
+def take_batches():
+    """Переименовывает pending.jsonl и возвращает файлы в обработке.
+
+    Файлы, оставшиеся от прерванного запуска, идут первыми; удаляет
+    файл вызывающий, когда записи сохранены.
+    """
+    directory = spool_dir()
+    pending = pending_path()
+    if pending.exists():
+        stamp = f"{timezone.now():%Y%m%d%H%M%S%f}"
+        os.replace(pending, directory / f"processing-{stamp}.jsonl")
+    return sorted(directory.glob("processing-*.jsonl"))
+
+
+def read_batch(path):
+    with open(path, "rb") as stream:
+        # Дожидаемся писателя, открывшего файл до переименования.
+        fcntl.flock(stream.fileno(), fcntl.LOCK_EX)
+        lines = stream.read().splitlines()
+    records = []
+    for line in lines:
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            # Строка, оборванная падением процесса во время записи.
+            continue
+    return records
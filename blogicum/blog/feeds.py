@@ -0,0 +1,196 @@
+"""RSS и Atom для ленты, категорий, авторов и мест.
+
+Готовый документ кэшируется до изменения данных (см. blog.cache) или
+истечения FEED_CACHE_SECONDS — так подхватываются отложенные публикации.
+Клиенты с If-None-Match/If-Modified-Since получают 304 без обращения
+к базе.
+"""
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.http import parse_http_date_safe
+from django.utils.text import Truncator
+
+from .cache import feed_key
+from .models import Post
+from .views import (
+    get_published_category,
+    get_published_location,
+    get_published_posts,
+)
+
+User = get_user_model()
+
+
+class PostsFeed(Feed):
+    def get_posts(self, obj):
+        return get_published_posts(Post.objects)
+
+    def items(self, obj):
+        return self.get_posts(obj).select_related("activity")[
+            :settings.FEED_ITEMS
+        ]
+
+    def item_title(self, post):
+        return post.title
+
+    def item_description(self, post):
+        return Truncator(post.text).words(60)
+
+    def item_link(self, post):
+        return reverse("blog:post_detail", args=[post.pk])
+
+    def item_pubdate(self, post):
+        return post.pub_date
+
+    def item_updateddate(self, post):
+        activity = getattr(post, "activity", None)
+        if activity is None:
+            return post.pub_date
+        return max(post.pub_date, activity.updated_at)
+
+    def item_author_name(self, post):
+        return post.author.get_full_name() or post.author.username
+
+    def item_author_link(self, post):
+        return reverse("blog:profile", args=[post.author.username])
+
+    def item_categories(self, post):
+        return [post.category.title] if post.category else []
+
+
+class AtomMixin:
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self._get_dynamic_attr("description", obj)
+
+
+class LatestPostsFeed(PostsFeed):
+    title = "Блогикум"
+    description = "Новые публикации"
+
+    def link(self):
+        return reverse("blog:index")
+
+
+class CategoryPostsFeed(PostsFeed):
+    def get_object(self, request, category_slug):
+        return get_published_category(category_slug)
+
+    def get_posts(self, category):
+        return super().get_posts(category).filter(category=category)
+
+    def title(self, category):
+        return f"Блогикум: {category.title}"
+
+    def description(self, category):
+        return category.description
+
+    def link(self, category):
+        return reverse("blog:category_posts", args=[category.slug])
+
+
+class AuthorPostsFeed(PostsFeed):
+    def get_object(self, request, username):
+        return get_object_or_404(User, username=username)
+
+    def get_posts(self, author):
+        return super().get_posts(author).filter(author=author)
+
+    def title(self, author):
+        return f"Блогикум: {author.get_full_name() or author.username}"
+
+    def description(self, author):
+        return f"Публикации пользователя {author.username}"
+
+    def link(self, author):
+        return reverse("blog:profile", args=[author.username])
+
+
+class LocationPostsFeed(PostsFeed):
+    def get_object(self, request, location_id):
+        return get_published_location(location_id)
+
+    def get_posts(self, location):
+        return super().get_posts(location).filter(location=location)
+
+    def title(self, location):
+        return f"Блогикум: {location.name}"
+
+    def description(self, location):
+        return f"Публикации из места «{location.name}»"
+
+    def link(self, location):
+        return reverse("blog:location_posts", args=[location.pk])
+
+
+class LatestPostsAtomFeed(AtomMixin, LatestPostsFeed):
+    pass
+
+
+class CategoryPostsAtomFeed(AtomMixin, CategoryPostsFeed):
+    pass
+
+
+class AuthorPostsAtomFeed(AtomMixin, AuthorPostsFeed):
+    pass
+
+
+class LocationPostsAtomFeed(AtomMixin, LocationPostsFeed):
+    pass
+
+
+def cached_feed(view):
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        # В ленте абсолютные ссылки: ключ зависит от схемы и хоста.
+        key = feed_key(
+            "feed", request.scheme, request.get_host(), request.path
+        )
+        entry = cache.get(key)
+        if entry is None:
+            response = view(request, *args, **kwargs)
+            content = response.content
+            entry = (
+                content,
+                response["Content-Type"],
+                f'"{hashlib.md5(content).hexdigest()}"',
+                response.get("Last-Modified"),
+            )
+            cache.set(key, entry, settings.FEED_CACHE_SECONDS)
+        content, content_type, etag, last_modified = entry
+        response = HttpResponse(content, content_type=content_type)
+        response["ETag"] = etag
+        if last_modified:
+            response["Last-Modified"] = last_modified
+        patch_cache_control(
+            response, public=True, max_age=settings.FEED_CACHE_SECONDS
+        )
+        return get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=parse_http_date_safe(last_modified or ""),
+            response=response,
+        )
+
+    return wrapper
+
+
+latest_posts_rss = cached_feed(LatestPostsFeed())
+latest_posts_atom = cached_feed(LatestPostsAtomFeed())
+category_posts_rss = cached_feed(CategoryPostsFeed())
+category_posts_atom = cached_feed(CategoryPostsAtomFeed())
+author_posts_rss = cached_feed(AuthorPostsFeed())
+author_posts_atom = cached_feed(AuthorPostsAtomFeed())
+location_posts_rss = cached_feed(LocationPostsFeed())
+location_posts_atom = cached_feed(LocationPostsAtomFeed())
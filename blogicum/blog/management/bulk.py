@@ -0,0 +1,73 @@
+from contextlib import contextmanager
+from itertools import islice
+
+from django.db import transaction
+from django.db.models import Max
+
+from blog.models import CommentActivity, PostActivity
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """Отключает auto_now/auto_now_add, чтобы сохранить заданные даты.
+
+    Нужно для массовой загрузки: bulk_create иначе перезаписывает
+    created_at текущим временем.
+    """
+    saved = []
+    for model in models:
+        for field in model._meta.concrete_fields:
+            if getattr(field, "auto_now", False) or getattr(
+                field, "auto_now_add", False
+            ):
+                saved.append((field, field.auto_now, field.auto_now_add))
+                field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def refresh_post_activity(posts, batch_size=5000):
+    """Пересоздаёт PostActivity постов, загруженных без сигналов."""
+    rows = (
+        posts.annotate(last_comment_at=Max("comments__created_at"))
+        .order_by("pk")
+        .values_list("pk", "created_at", "last_comment_at")
+    )
+    for batch in batched(rows.iterator(chunk_size=batch_size), batch_size):
+        with transaction.atomic():
+            PostActivity.objects.filter(
+                pk__gte=batch[0][0], pk__lte=batch[-1][0]
+            ).delete()
+            PostActivity.objects.bulk_create(
+                PostActivity(
+                    post_id=pk,
+                    updated_at=created_at,
+                    last_activity_at=max(
+                        created_at, last_comment_at or created_at
+                    ),
+                )
+                for pk, created_at, last_comment_at in batch
+            )
+
+
+def refresh_comment_activity(comments, batch_size=5000):
+    """Создаёт недостающие CommentActivity комментариев без сигналов."""
+    rows = (
+        comments.filter(activity__isnull=True)
+        .order_by("pk")
+        .values_list("pk", "created_at")
+    )
+    for batch in batched(rows.iterator(chunk_size=batch_size), batch_size):
+        CommentActivity.objects.bulk_create(
+            CommentActivity(comment_id=pk, updated_at=created_at)
+            for pk, created_at in batch
+        )
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from blog import popularity
+
+
+class Command(BaseCommand):
+    help = (
+        "Убирает из рейтинга популярных посты, чьи комментарии устарели. "
+        "Запускается по расписанию, например раз в час. С --rebuild "
+        "пересчитывает рейтинг по комментариям заново."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rebuild", action="store_true")
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        if options["rebuild"]:
+            removed = popularity.rebuild(options["batch_size"])
+        else:
+            removed = popularity.prune()
+        self.stdout.write(f"Убрано из рейтинга: {removed}.")
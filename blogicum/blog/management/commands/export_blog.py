@@ -0,0 +1,52 @@
+import sys
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from blog.management.interchange import (
+    CSVWriter, JSONLinesWriter, csv_path, exported_fields, exported_models,
+    open_text, to_record,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Выгружает пользователей, категории, места, публикации и "
+        "комментарии в JSON Lines (один файл, «-» — стандартный вывод, "
+        ".gz — со сжатием) или в CSV (каталог с файлом на модель). "
+        "Записи читаются из базы порциями, память не растёт с объёмом."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument(
+            "--format", choices=("jsonl", "csv"), default="jsonl"
+        )
+        parser.add_argument("--batch-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        self.batch_size = options["batch_size"]
+        path = options["path"]
+        if options["format"] == "csv":
+            Path(path).mkdir(parents=True, exist_ok=True)
+            for model in exported_models():
+                fields = exported_fields(model)
+                with open_text(csv_path(path, model), "w") as stream:
+                    self.export(model, CSVWriter(stream, fields), fields)
+        elif path == "-":
+            self.export_all(JSONLinesWriter(sys.stdout))
+        else:
+            with open_text(path, "w") as stream:
+                self.export_all(JSONLinesWriter(stream))
+
+    def export_all(self, writer):
+        for model in exported_models():
+            self.export(model, writer, exported_fields(model))
+
+    def export(self, model, writer, fields):
+        queryset = model._base_manager.order_by("pk")
+        count = 0
+        for obj in queryset.iterator(chunk_size=self.batch_size):
+            writer.write(to_record(obj, fields))
+            count += 1
+        self.stderr.write(f"{model._meta.verbose_name_plural}: {count}")
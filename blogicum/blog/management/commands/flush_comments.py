@@ -0,0 +1,115 @@
+import time
+from collections import defaultdict
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from blog import api, comment_queue, popularity, sitemaps, stats
+from blog.cache import bump_version
+from blog.management.bulk import (
+    batched, explicit_timestamps, refresh_comment_activity,
+)
+from blog.models import Comment, Post, PostActivity
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Переносит комментарии из очереди (COMMENT_BUFFERING) в базу "
+        "пакетами bulk_create и выполняет то, что при обычном сохранении "
+        "делают сигналы: активность поста, счётчики, рейтинг, кэши. "
+        "Повторный запуск после сбоя не создаёт дубликатов."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once", action="store_true",
+            help="Разобрать очередь один раз и выйти.",
+        )
+        parser.add_argument(
+            "--interval", type=float, default=1.0,
+            help="Пауза между разборами очереди в секундах.",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        while True:
+            for path in comment_queue.take_batches():
+                records = comment_queue.read_batch(path)
+                for batch in batched(records, options["batch_size"]):
+                    self.save(batch)
+                path.unlink()
+            if options["once"]:
+                return
+            time.sleep(options["interval"])
+
+    def save(self, records):
+        comments = self.new_comments(records)
+        if not comments:
+            return
+        with transaction.atomic(), explicit_timestamps(Comment):
+            Comment.objects.bulk_create(comments)
+            self.apply_side_effects(comments)
+        self.stdout.write(
+            f"{timezone.now():%Y-%m-%d %H:%M:%S}: "
+            f"сохранено комментариев {len(comments)}"
+        )
+
+    def new_comments(self, records):
+        comments = [
+            Comment(
+                post_id=record["post_id"],
+                author_id=record["author_id"],
+                text=record["text"],
+                created_at=parse_datetime(record["created_at"]),
+            )
+            for record in records
+        ]
+        post_ids = set(
+            Post.objects.filter(
+                pk__in={comment.post_id for comment in comments}
+            ).values_list("pk", flat=True)
+        )
+        author_ids = set(
+            User.objects.filter(
+                pk__in={comment.author_id for comment in comments}
+            ).values_list("pk", flat=True)
+        )
+        # Уже сохранённые прошлым, прерванным запуском.
+        saved = set(
+            Comment.objects.filter(
+                post_id__in=post_ids,
+                created_at__in={comment.created_at for comment in comments},
+            ).values_list("post_id", "author_id", "created_at")
+        )
+        return [
+            comment for comment in comments
+            if comment.post_id in post_ids
+            and comment.author_id in author_ids
+            and (comment.post_id, comment.author_id, comment.created_at)
+            not in saved
+        ]
+
+    def apply_side_effects(self, comments):
+        by_post = defaultdict(list)
+        by_author = defaultdict(int)
+        for comment in comments:
+            by_post[comment.post_id].append(comment.created_at)
+            by_author[comment.author_id] += 1
+        refresh_comment_activity(Comment.objects.filter(
+            post_id__in=by_post,
+            created_at__in={comment.created_at for comment in comments},
+        ))
+        PostActivity.objects.filter(post_id__in=by_post).update(
+            last_activity_at=timezone.now()
+        )
+        for post_id, moments in by_post.items():
+            popularity.add_comments(post_id, moments)
+            sitemaps.invalidate_object("posts", post_id)
+        for author_id, count in by_author.items():
+            stats.add_comments(author_id, count)
+        bump_version(api.API_VERSION)
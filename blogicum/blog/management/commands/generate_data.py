@@ -0,0 +1,226 @@
+import random
+from datetime import timedelta
+from itertools import accumulate
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+from faker import Faker
+
+from blog.management.bulk import (
+    batched, explicit_timestamps, refresh_comment_activity,
+    refresh_post_activity,
+)
+from blog import archive, popularity, stats, visibility
+from blog.models import Category, Comment, Location, Post
+
+User = get_user_model()
+
+
+def zipf_weights(count, exponent):
+    """Накопленные веса распределения Ципфа: первые элементы «горячие»."""
+    return list(accumulate(1 / (rank ** exponent)
+                           for rank in range(1, count + 1)))
+
+
+class SkewedChoice:
+    def __init__(self, rng, items, exponent):
+        self.rng = rng
+        self.items = list(items)
+        rng.shuffle(self.items)
+        self.cum_weights = zipf_weights(len(self.items), exponent)
+
+    def sample(self, k):
+        return self.rng.choices(self.items, cum_weights=self.cum_weights, k=k)
+
+
+class Command(BaseCommand):
+    help = (
+        "Массово создаёт пользователей, категории, места, публикации и "
+        "комментарии с реалистичным перекосом: немногие авторы пишут "
+        "большую часть постов, немногие посты собирают большую часть "
+        "комментариев."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10_000)
+        parser.add_argument("--categories", type=int, default=50)
+        parser.add_argument("--locations", type=int, default=500)
+        parser.add_argument("--posts", type=int, default=100_000)
+        parser.add_argument("--comments", type=int, default=500_000)
+        parser.add_argument("--days", type=int, default=3 * 365,
+                            help="Глубина истории публикаций в днях.")
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--seed", type=int, default=None)
+        parser.add_argument("--author-skew", type=float, default=1.1)
+        parser.add_argument("--post-skew", type=float, default=1.2)
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options["seed"])
+        self.fake = Faker("ru_RU")
+        self.fake.seed_instance(options["seed"])
+        self.batch_size = options["batch_size"]
+        self.now = timezone.now()
+
+        user_ids = self.create_users(options["users"])
+        category_ids = self.create_objects(
+            Category, options["categories"], self.build_category
+        )
+        location_ids = self.create_objects(
+            Location, options["locations"], self.build_location
+        )
+        posts = self.create_posts(
+            options["posts"],
+            SkewedChoice(self.rng, user_ids, options["author_skew"]),
+            SkewedChoice(self.rng, category_ids, 1.0),
+            location_ids,
+            options["days"],
+        )
+        # Отложенные посты ещё не опубликованы — комментировать их нельзя.
+        self.create_comments(
+            options["comments"],
+            SkewedChoice(
+                self.rng,
+                [post for post in posts if post[1] <= self.now],
+                options["post_skew"],
+            ),
+            SkewedChoice(self.rng, user_ids, options["author_skew"]),
+            self.now - timedelta(days=options["days"]),
+        )
+        if posts:
+            # bulk_create не вызывает сигналы, которые ведут PostActivity,
+            # CommentActivity, Post.is_visible, AuthorStats, PostScore и
+            # MonthlyPostCount.
+            created = Post.objects.filter(
+                pk__range=(posts[0][0], posts[-1][0])
+            )
+            refresh_post_activity(created, self.batch_size)
+            refresh_comment_activity(
+                Comment.objects.filter(post__in=created), self.batch_size
+            )
+            visibility.refresh(created)
+        stats.rebuild(user_ids)
+        popularity.rebuild(self.batch_size)
+        archive.rebuild()
+
+    def new_ids(self, model, previous_max):
+        return list(
+            model.objects.filter(pk__gt=previous_max or 0)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+
+    def insert(self, model, objects, total):
+        created = 0
+        with explicit_timestamps(model):
+            for batch in batched(objects, self.batch_size):
+                with transaction.atomic():
+                    model.objects.bulk_create(batch)
+                created += len(batch)
+                self.stdout.write(
+                    f"\r{model._meta.verbose_name_plural}: {created}/{total}",
+                    ending="",
+                )
+        self.stdout.write("")
+
+    def create_objects(self, model, count, build):
+        previous_max = model.objects.aggregate(Max("pk"))["pk__max"]
+        self.insert(model, (build(i) for i in range(count)), count)
+        return self.new_ids(model, previous_max)
+
+    def create_users(self, count):
+        password = make_password(None)
+        previous_max = User.objects.aggregate(Max("pk"))["pk__max"] or 0
+
+        def build(i):
+            return User(
+                username=f"{self.fake.user_name()}_{previous_max + i}",
+                first_name=self.fake.first_name(),
+                last_name=self.fake.last_name(),
+                email=self.fake.email(),
+                password=password,
+                date_joined=self.random_date(3 * 365),
+            )
+
+        self.insert(User, (build(i) for i in range(count)), count)
+        return self.new_ids(User, previous_max)
+
+    def build_category(self, i):
+        created_at = self.random_date(3 * 365)
+        return Category(
+            title=self.fake.sentence(nb_words=2).rstrip("."),
+            description=self.fake.paragraph(nb_sentences=2),
+            slug=f"category-{self.rng.getrandbits(40):x}-{i}",
+            is_published=self.rng.random() < 0.9,
+            created_at=created_at,
+            updated_at=created_at,
+        )
+
+    def build_location(self, i):
+        created_at = self.random_date(3 * 365)
+        return Location(
+            name=self.fake.city(),
+            is_published=self.rng.random() < 0.9,
+            created_at=created_at,
+            updated_at=created_at,
+        )
+
+    def random_date(self, days):
+        return self.now - timedelta(seconds=self.rng.uniform(0, days * 86400))
+
+    def create_posts(self, count, authors, categories, location_ids, days):
+        previous_max = Post.objects.aggregate(Max("pk"))["pk__max"] or 0
+        author_ids = iter(authors.sample(count))
+        category_ids = iter(categories.sample(count))
+
+        def build(i):
+            # Небольшая доля отложенных публикаций с датой в будущем.
+            if self.rng.random() < 0.01:
+                pub_date = self.now + timedelta(
+                    seconds=self.rng.uniform(0, 30 * 86400)
+                )
+            else:
+                pub_date = self.random_date(days)
+            return Post(
+                title=self.fake.sentence(nb_words=5).rstrip(".")[:256],
+                text=self.fake.paragraph(nb_sentences=8),
+                author_id=next(author_ids),
+                category_id=next(category_ids),
+                location_id=(
+                    self.rng.choice(location_ids)
+                    if location_ids and self.rng.random() < 0.7 else None
+                ),
+                is_published=self.rng.random() < 0.95,
+                pub_date=pub_date,
+                created_at=min(pub_date, self.now),
+            )
+
+        self.insert(Post, (build(i) for i in range(count)), count)
+        return list(
+            Post.objects.filter(pk__gt=previous_max)
+            .order_by("pk")
+            .values_list("pk", "pub_date")
+        )
+
+    def create_comments(self, count, posts, authors, start):
+        if not posts.items:
+            return
+        targets = iter(posts.sample(count))
+        author_ids = iter(authors.sample(count))
+
+        def build(i):
+            post_id, pub_date = next(targets)
+            # Большинство комментариев появляется в первые дни после поста;
+            # дата всегда в [max(pub_date, start), now].
+            delay = timedelta(seconds=self.rng.expovariate(1 / 86400))
+            return Comment(
+                post_id=post_id,
+                author_id=next(author_ids),
+                text=self.fake.sentence(nb_words=12),
+                created_at=min(max(pub_date, start) + delay, self.now),
+            )
+
+        self.insert(Comment, (build(i) for i in range(count)), count)
@@ -0,0 +1,86 @@
+from itertools import groupby
+from pathlib import Path
+
+from django.core import serializers
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import DatabaseError, connection, transaction
+
+from blog.management.bulk import batched, explicit_timestamps
+from blog.management.interchange import (
+    csv_path, exported_models, open_text, read_csv, read_json_lines,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Загружает данные, выгруженные export_blog, пакетами bulk_create "
+        "с сохранением первичных ключей. Файл читается потоково; внешние "
+        "ключи проверяются один раз в конце, поэтому порядок записей "
+        "не важен. Всё выполняется в одной транзакции."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument(
+            "--format", choices=("jsonl", "csv"), default=None,
+            help="По умолчанию: csv для каталога, иначе jsonl.",
+        )
+        parser.add_argument("--batch-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        if not path.exists():
+            raise CommandError(f"Нет такого файла или каталога: {path}")
+        csv_format = options["format"] == "csv" or (
+            options["format"] is None and path.is_dir()
+        )
+        models = exported_models()
+        self.counts = dict.fromkeys(models, 0)
+        try:
+            with transaction.atomic(), \
+                    connection.constraint_checks_disabled(), \
+                    explicit_timestamps(*models):
+                if csv_format:
+                    for model in models:
+                        file_path = csv_path(path, model)
+                        if file_path.exists():
+                            with open_text(file_path, "r") as stream:
+                                self.load(read_csv(stream, model),
+                                          options["batch_size"])
+                else:
+                    with open_text(path, "r") as stream:
+                        self.load(read_json_lines(stream),
+                                  options["batch_size"])
+                connection.check_constraints(table_names=[
+                    model._meta.db_table for model in models
+                ])
+        except (ValueError, serializers.base.DeserializationError) as error:
+            raise CommandError(f"Некорректные данные: {error}")
+        except DatabaseError as error:
+            raise CommandError(f"Данные не загружены: {error}")
+        self.reset_sequences(models)
+        for model, count in self.counts.items():
+            self.stdout.write(f"{model._meta.verbose_name_plural}: {count}")
+
+    def load(self, records, batch_size):
+        for label, group in groupby(records, key=lambda r: r["model"]):
+            for batch in batched(group, batch_size):
+                objects = [
+                    deserialized.object
+                    for deserialized in serializers.deserialize(
+                        "python", batch
+                    )
+                ]
+                model = type(objects[0])
+                if model not in self.counts:
+                    raise CommandError(f"Неожиданная модель: {label}")
+                model._base_manager.bulk_create(objects)
+                self.counts[model] += len(objects)
+
+    def reset_sequences(self, models):
+        statements = connection.ops.sequence_reset_sql(no_style(), models)
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from blog import archive
+
+
+class Command(BaseCommand):
+    help = (
+        "Пересобирает MonthlyPostCount по опубликованным постам: после "
+        "массовых загрузок или если отложенные публикации наступили без "
+        "run_publication_scheduler."
+    )
+
+    def handle(self, *args, **options):
+        archive.rebuild()
+        self.stdout.write("Архив пересобран.")
@@ -0,0 +1,31 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from blog import stats
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Пересчитывает AuthorStats по постам и комментариям. Запускается "
+        "по расписанию: исправляет расхождения после массовых операций "
+        "в обход сигналов."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        last_pk = 0
+        total = 0
+        while author_ids := list(
+            User.objects.filter(pk__gt=last_pk)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:batch_size]
+        ):
+            stats.rebuild(author_ids, batch_size)
+            last_pk = author_ids[-1]
+            total += len(author_ids)
+        self.stdout.write(f"Статистика пересчитана: {total} авторов.")
@@ -0,0 +1,80 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.models import Post
+from blog.signals import post_published
+
+WATERMARK_KEY = "blog:scheduler:watermark"
+
+
+class Command(BaseCommand):
+    help = (
+        "Отправляет сигнал post_published, когда наступает pub_date "
+        "отложенной публикации, чтобы сбросить кэши лент, API и карты "
+        "сайта. Ближайшая дата берётся по индексу (is_visible, pub_date); "
+        "между событиями процесс спит. Кэш должен быть общим с "
+        "веб-процессами (memcached), иначе сброс их не затронет."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once", action="store_true",
+            help="Обработать наступившие публикации и выйти.",
+        )
+        parser.add_argument(
+            "--max-sleep", type=float, default=60.0,
+            help="Предел сна в секундах: новые отложенные посты "
+                 "замечаются не позже этого срока.",
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        self.batch_size = options["batch_size"]
+        # После простоя догоняем публикации, которые могли остаться
+        # в ещё живых кэшах.
+        watermark = cache.get(WATERMARK_KEY) or timezone.now() - timedelta(
+            seconds=max(
+                settings.FEED_CACHE_SECONDS,
+                settings.API_CACHE_SECONDS,
+                settings.SITEMAP_CACHE_SECONDS,
+            )
+        )
+        while True:
+            now = timezone.now()
+            self.publish_due(watermark, now)
+            watermark = now
+            cache.set(WATERMARK_KEY, watermark, None)
+            if options["once"]:
+                return
+            time.sleep(self.seconds_until_next(now, options["max_sleep"]))
+
+    def publish_due(self, watermark, now):
+        due = (
+            Post.objects.filter(
+                is_visible=True, pub_date__gt=watermark, pub_date__lte=now
+            )
+            .order_by("pub_date", "pk")
+            .only("pk", "pub_date", "author_id", "category_id")
+        )
+        count = 0
+        for post in due.iterator(chunk_size=self.batch_size):
+            post_published.send(sender=Post, post=post)
+            count += 1
+        if count:
+            self.stdout.write(f"{now:%Y-%m-%d %H:%M:%S}: опубликовано {count}")
+
+    def seconds_until_next(self, now, max_sleep):
+        next_pub_date = (
+            Post.objects.filter(is_visible=True, pub_date__gt=now)
+            .order_by("pub_date")
+            .values_list("pub_date", flat=True)
+            .first()
+        )
+        if next_pub_date is None:
+            return max_sleep
+        return min(max((next_pub_date - now).total_seconds(), 0), max_sleep)
@@ -0,0 +1,129 @@
+"""Потоковый обмен данными блога: JSON Lines и CSV.
+
+Каждая строка JSONL — запись в формате сериализаторов Django
+({"model": ..., "pk": ..., "fields": {...}}), поэтому файл читается
+построчно, без загрузки целиком, как db.json в loaddata. В формате CSV
+выгрузка — каталог с файлом на модель: pk и поля по столбцам.
+"""
+import csv
+import datetime
+import gzip
+import json
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.encoding import is_protected_type
+
+from blog.models import (
+    AuthorStats, Category, Comment, CommentActivity, Location,
+    MonthlyPostCount, Post, PostActivity, PostScore,
+)
+
+
+def exported_models():
+    # Порядок важен для CSV: сначала те, на кого ссылаются.
+    return (
+        get_user_model(), Category, Location, Post, Comment, PostActivity,
+        CommentActivity, AuthorStats, PostScore, MonthlyPostCount,
+    )
+
+
+def model_label(model):
+    return model._meta.label_lower
+
+
+def exported_fields(model):
+    # Связи «многие ко многим» (группы и права пользователей) не
+    # переносятся: их ключи не совпадают между базами.
+    return [
+        field for field in model._meta.concrete_fields
+        if not field.primary_key
+    ]
+
+
+def field_value(obj, field):
+    # Как в сериализаторах Django: простые типы как есть, остальное
+    # (например, файлы) — строкой.
+    value = getattr(obj, field.attname)
+    if field.is_relation or is_protected_type(value):
+        return value
+    return field.value_to_string(obj)
+
+
+def to_record(obj, fields):
+    return {
+        "model": model_label(type(obj)),
+        "pk": obj.pk,
+        "fields": {field.name: field_value(obj, field) for field in fields},
+    }
+
+
+def open_text(path, mode):
+    if str(path).endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8", newline="")
+    return open(path, mode, encoding="utf-8", newline="")
+
+
+class RecordEncoder(DjangoJSONEncoder):
+    def default(self, o):
+        # DjangoJSONEncoder обрезает время до миллисекунд.
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+class JSONLinesWriter:
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, record):
+        self.stream.write(
+            json.dumps(record, cls=RecordEncoder, ensure_ascii=False)
+        )
+        self.stream.write("\n")
+
+
+def read_json_lines(stream):
+    for number, line in enumerate(stream, 1):
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except ValueError as error:
+                raise ValueError(f"Строка {number}: {error}") from None
+
+
+def csv_path(directory, model):
+    return Path(directory) / f"{model_label(model)}.csv"
+
+
+class CSVWriter:
+    def __init__(self, stream, fields):
+        self.fields = fields
+        self.writer = csv.writer(stream)
+        self.writer.writerow(["pk"] + [field.name for field in fields])
+
+    def write(self, record):
+        values = record["fields"]
+        self.writer.writerow([record["pk"]] + [
+            "" if values[field.name] is None else values[field.name]
+            for field in self.fields
+        ])
+
+
+def read_csv(stream, model):
+    reader = csv.reader(stream)
+    header = next(reader, None)
+    if not header or header[0] != "pk":
+        return
+    fields = [model._meta.get_field(name) for name in header[1:]]
+    label = model_label(model)
+    for row in reader:
+        yield {
+            "model": label,
+            "pk": row[0],
+            "fields": {
+                field.name: None if value == "" and field.null else value
+                for field, value in zip(fields, row[1:])
+            },
+        }
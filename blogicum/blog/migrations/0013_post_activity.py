@@ -0,0 +1,63 @@
+# Generated by Django 3.2.16 on 2026-10-19 19:51
+
+from itertools import islice
+
+from django.db import migrations, models
+from django.db.models import F, Max
+import django.db.models.deletion
+
+
+def backfill(apps, schema_editor):
+    # Точное время изменения неизвестно: берём время создания.
+    for name in ("Category", "Location"):
+        apps.get_model("blog", name).objects.update(updated_at=F("created_at"))
+    Post = apps.get_model("blog", "Post")
+    PostActivity = apps.get_model("blog", "PostActivity")
+    rows = (
+        Post.objects.annotate(last_comment_at=Max("comments__created_at"))
+        .order_by("pk")
+        .values_list("pk", "created_at", "last_comment_at")
+        .iterator()
+    )
+    while batch := list(islice(rows, 5000)):
+        PostActivity.objects.bulk_create(
+            PostActivity(
+                post_id=pk,
+                updated_at=created_at,
+                last_activity_at=max(created_at, last_comment_at or created_at),
+            )
+            for pk, created_at, last_comment_at in batch
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0012_alter_post_options'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostActivity',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='activity', serialize=False, to='blog.post', verbose_name='Пост')),
+                ('updated_at', models.DateTimeField(db_index=True, verbose_name='Пост изменён')),
+                ('last_activity_at', models.DateTimeField(db_index=True, help_text='Изменение поста или добавление, правка, удаление комментария.', verbose_name='Последняя активность')),
+            ],
+            options={
+                'verbose_name': 'активность публикации',
+                'verbose_name_plural': 'Активность публикаций',
+            },
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True, verbose_name='Изменено'),
+        ),
+        migrations.AddField(
+            model_name='location',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True, verbose_name='Изменено'),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 3.2.16 on 2026-10-19 19:58
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+import django.db.models.deletion
+
+
+def backfill(apps, schema_editor):
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split("."))
+    Post = apps.get_model("blog", "Post")
+    Comment = apps.get_model("blog", "Comment")
+    AuthorStats = apps.get_model("blog", "AuthorStats")
+    published = Q(is_visible=True, pub_date__lte=timezone.now())
+    posts = {
+        row.pop("author_id"): row
+        for row in Post.objects.order_by().values("author_id").annotate(
+            total_posts=Count("pk"),
+            published_posts=Count("pk", filter=published),
+            last_post_at=Max("pub_date", filter=published),
+        )
+    }
+    comments = dict(
+        Comment.objects.order_by().values("author_id")
+        .annotate(count=Count("pk")).values_list("author_id", "count")
+    )
+    AuthorStats.objects.bulk_create(
+        (
+            AuthorStats(
+                author_id=pk,
+                comments=comments.get(pk, 0),
+                **posts.get(pk, {}),
+            )
+            for pk in User.objects.values_list("pk", flat=True).iterator()
+        ),
+        batch_size=5000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('blog', '0014_post_is_visible'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthorStats',
+            fields=[
+                ('author', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to=settings.AUTH_USER_MODEL, verbose_name='Автор')),
+                ('published_posts', models.PositiveIntegerField(default=0, verbose_name='Опубликовано постов')),
+                ('total_posts', models.PositiveIntegerField(default=0, help_text='Включая снятые с публикации и отложенные.', verbose_name='Всего постов')),
+                ('comments', models.PositiveIntegerField(default=0, verbose_name='Комментариев')),
+                ('last_post_at', models.DateTimeField(blank=True, null=True, verbose_name='Последняя публикация')),
+            ],
+            options={
+                'verbose_name': 'статистика автора',
+                'verbose_name_plural': 'Статистика авторов',
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 3.2.16 on 2026-10-19 20:01
+
+import math
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db import migrations, models
+from django.utils import timezone
+import django.db.models.deletion
+
+
+def backfill(apps, schema_editor):
+    # То же, что blog.popularity.rebuild, на исторических моделях; параметры
+    # зафиксированы значениями, с которыми рейтинг был введён.
+    Comment = apps.get_model("blog", "Comment")
+    PostScore = apps.get_model("blog", "PostScore")
+    epoch = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+    half_life = 24 * 60 * 60
+    min_weight = 0.05
+    horizon = timezone.now() - timedelta(
+        seconds=half_life * -math.log2(min_weight)
+    )
+    sums = {}
+    rows = (
+        Comment.objects.filter(created_at__gte=horizon)
+        .exclude(post_id=None)
+        .values_list("post_id", "created_at")
+        .iterator()
+    )
+    for post_id, created_at in rows:
+        weight = 2 ** ((created_at - horizon).total_seconds() / half_life)
+        sums[post_id] = sums.get(post_id, 0) + weight
+    offset = (horizon - epoch).total_seconds() / half_life
+    PostScore.objects.bulk_create(
+        (
+            PostScore(post_id=post_id, score=offset + math.log2(total))
+            for post_id, total in sums.items()
+        ),
+        batch_size=5000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0015_author_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostScore',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='score', serialize=False, to='blog.post', verbose_name='Пост')),
+                ('score', models.FloatField(db_index=True, verbose_name='Рейтинг')),
+            ],
+            options={
+                'verbose_name': 'рейтинг публикации',
+                'verbose_name_plural': 'Рейтинг публикаций',
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 3.2.16 on 2026-10-19 20:03
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+import django.db.models.deletion
+
+
+def backfill(apps, schema_editor):
+    Post = apps.get_model("blog", "Post")
+    MonthlyPostCount = apps.get_model("blog", "MonthlyPostCount")
+    rows = (
+        Post.objects.filter(is_visible=True, pub_date__lte=timezone.now())
+        .annotate(month_start=TruncMonth("pub_date"))
+        .order_by()
+        .values("month_start", "category_id")
+        .annotate(count=Count("pk"))
+        .values_list("month_start", "category_id", "count")
+    )
+    buckets = {}
+    for month_start, category_id, count in rows:
+        key = (month_start.year, month_start.month)
+        buckets[key + (category_id,)] = count
+        buckets[key + (None,)] = buckets.get(key + (None,), 0) + count
+    MonthlyPostCount.objects.bulk_create(
+        MonthlyPostCount(
+            year=year, month=month, category_id=category_id, count=count
+        )
+        for (year, month, category_id), count in buckets.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0016_post_score'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyPostCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField(verbose_name='Год')),
+                ('month', models.PositiveSmallIntegerField(verbose_name='Месяц')),
+                ('count', models.PositiveIntegerField(verbose_name='Публикаций')),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='monthly_counts', to='blog.category', verbose_name='Категория')),
+            ],
+            options={
+                'verbose_name': 'публикации за месяц',
+                'verbose_name_plural': 'Публикации по месяцам',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='monthlypostcount',
+            constraint=models.UniqueConstraint(condition=models.Q(('category__isnull', False)), fields=('category', 'year', 'month'), name='monthly_count_category_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='monthlypostcount',
+            constraint=models.UniqueConstraint(condition=models.Q(('category__isnull', True)), fields=('year', 'month'), name='monthly_count_total_uniq'),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 3.2.16 on 2026-10-19 20:16
+
+from itertools import islice
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill(apps, schema_editor):
+    # Точное время изменения неизвестно: берём время создания.
+    Comment = apps.get_model("blog", "Comment")
+    CommentActivity = apps.get_model("blog", "CommentActivity")
+    rows = Comment.objects.order_by("pk").values_list(
+        "pk", "created_at"
+    ).iterator()
+    while batch := list(islice(rows, 5000)):
+        CommentActivity.objects.bulk_create(
+            CommentActivity(comment_id=pk, updated_at=created_at)
+            for pk, created_at in batch
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0018_post_location_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CommentActivity',
+            fields=[
+                ('comment', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='activity', serialize=False, to='blog.comment', verbose_name='Комментарий')),
+                ('updated_at', models.DateTimeField(db_index=True, verbose_name='Комментарий изменён')),
+            ],
+            options={
+                'verbose_name': 'активность комментария',
+                'verbose_name_plural': 'Активность комментариев',
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -21,6 +21,15 @@ class PublishedBaseModel(models.Model):
         abstract = True
 
 
+class ModifiedBaseModel(PublishedBaseModel):
+    updated_at = models.DateTimeField(
+        verbose_name="Изменено", auto_now=True, db_index=True
+    )
+
+    class Meta:
+        abstract = True
+
+
 class PostBaseModel(PublishedBaseModel):
     author = models.ForeignKey(
         User,
@@ -69,16 +78,34 @@ class Post(PostBaseModel):
         verbose_name="Фото", upload_to="post_images", blank=True
     )
 
+    is_visible = models.BooleanField(
+        verbose_name="Видна в ленте",
+        default=False,
+        editable=False,
+        help_text="Пост и его категория опубликованы; ведётся сигналами "
+                  "(blog.visibility).",
+    )
+
     class Meta:
         verbose_name = "публикация"
         verbose_name_plural = "Публикации"
         ordering = ("-pub_date",)
+        indexes = (
+            models.Index(
+                fields=("is_visible", "pub_date"),
+                name="post_visible_pub_date_idx",
+            ),
+            models.Index(
+                fields=("location", "pub_date"),
+                name="post_location_pub_date_idx",
+            ),
+        )
 
     def __str__(self):
         return f"{self.title}, {self.author}"
 
 
-class Category(PublishedBaseModel):
+class Category(ModifiedBaseModel):
     title = models.CharField(
         verbose_name="Заголовок", max_length=256, null=False, blank=False
     )
@@ -104,7 +131,7 @@ class Category(PublishedBaseModel):
         return self.title
 
 
-class Location(PublishedBaseModel):
+class Location(ModifiedBaseModel):
     name = models.CharField(
         verbose_name="Название места", max_length=256, null=False, blank=False
     )
@@ -117,6 +144,135 @@ class Location(PublishedBaseModel):
         return self.name
 
 
+class PostActivity(models.Model):
+    """Время изменения поста и активности в его комментариях.
+
+    Отдельная таблица: комментарии обновляют узкую строку, не трогая пост,
+    а набор полей Post остаётся прежним.
+    """
+
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="activity",
+        verbose_name="Пост",
+    )
+    updated_at = models.DateTimeField(
+        verbose_name="Пост изменён", db_index=True
+    )
+    last_activity_at = models.DateTimeField(
+        verbose_name="Последняя активность",
+        db_index=True,
+        help_text="Изменение поста или добавление, правка, удаление "
+                  "комментария.",
+    )
+
+    class Meta:
+        verbose_name = "активность публикации"
+        verbose_name_plural = "Активность публикаций"
+
+    def __str__(self):
+        return f"{self.post_id}: {self.last_activity_at}"
+
+
+class AuthorStats(models.Model):
+    """Счётчики автора для шапки профиля (blog.stats).
+
+    Ведутся сигналами, расхождения исправляет reconcile_author_stats.
+    """
+
+    author = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="stats",
+        verbose_name="Автор",
+    )
+    published_posts = models.PositiveIntegerField(
+        verbose_name="Опубликовано постов", default=0
+    )
+    total_posts = models.PositiveIntegerField(
+        verbose_name="Всего постов", default=0,
+        help_text="Включая снятые с публикации и отложенные.",
+    )
+    comments = models.PositiveIntegerField(
+        verbose_name="Комментариев", default=0
+    )
+    last_post_at = models.DateTimeField(
+        verbose_name="Последняя публикация", null=True, blank=True
+    )
+
+    class Meta:
+        verbose_name = "статистика автора"
+        verbose_name_plural = "Статистика авторов"
+
+    def __str__(self):
+        return f"{self.author_id}: {self.published_posts}"
+
+
+class PostScore(models.Model):
+    """Популярность поста по затухающей активности комментариев.
+
+    score — log2 суммы весов комментариев (blog.popularity); строки есть
+    только у постов с недавними комментариями.
+    """
+
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="score",
+        verbose_name="Пост",
+    )
+    score = models.FloatField(verbose_name="Рейтинг", db_index=True)
+
+    class Meta:
+        verbose_name = "рейтинг публикации"
+        verbose_name_plural = "Рейтинг публикаций"
+
+    def __str__(self):
+        return f"{self.post_id}: {self.score:.3f}"
+
+
+class MonthlyPostCount(models.Model):
+    """Число опубликованных постов за месяц: всего и по категориям.
+
+    Строка без категории — итог месяца. Ведётся blog.archive.
+    """
+
+    year = models.PositiveSmallIntegerField(verbose_name="Год")
+    month = models.PositiveSmallIntegerField(verbose_name="Месяц")
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        verbose_name="Категория",
+        related_name="monthly_counts",
+    )
+    count = models.PositiveIntegerField(verbose_name="Публикаций")
+
+    class Meta:
+        verbose_name = "публикации за месяц"
+        verbose_name_plural = "Публикации по месяцам"
+        constraints = (
+            models.UniqueConstraint(
+                fields=("category", "year", "month"),
+                condition=models.Q(category__isnull=False),
+                name="monthly_count_category_uniq",
+            ),
+            models.UniqueConstraint(
+                fields=("year", "month"),
+                condition=models.Q(category__isnull=True),
+                name="monthly_count_total_uniq",
+            ),
+        )
+
+    def __str__(self):
+        return f"{self.year}-{self.month:02}: {self.count}"
+
+
 class Comment(PostBaseModel):
     post = models.ForeignKey(
         Post,
@@ -135,3 +291,29 @@ class Comment(PostBaseModel):
 
     def __str__(self):
         return self.text[:50]
+
+
+class CommentActivity(models.Model):
+    """Время изменения комментария.
+
+    Отдельная таблица по той же причине, что и PostActivity: набор полей
+    Comment остаётся прежним.
+    """
+
+    comment = models.OneToOneField(
+        Comment,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="activity",
+        verbose_name="Комментарий",
+    )
+    updated_at = models.DateTimeField(
+        verbose_name="Комментарий изменён", db_index=True
+    )
+
+    class Meta:
+        verbose_name = "активность комментария"
+        verbose_name_plural = "Активность комментариев"
+
+    def __str__(self):
+        return f"{self.comment_id}: {self.updated_at}"
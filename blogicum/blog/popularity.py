@@ -0,0 +1,111 @@
+"""Рейтинг популярных постов: PostScore.
+
+Комментарий весит 2 ** ((created_at - EPOCH) / T), где T —
+POPULAR_HALF_LIFE_SECONDS. Веса всех постов растут с одной скоростью,
+поэтому порядок по сумме весов совпадает с порядком по затухающему
+счёту, и со временем строки пересчитывать не нужно: комментарий
+прибавляет свой вес, удаление вычитает его же. Хранится log2 суммы —
+он растёт линейно и не переполняется. decay_post_scores убирает строки,
+чей вклад в рейтинг стал пренебрежимо мал.
+"""
+import math
+from datetime import datetime, timedelta, timezone as dt_timezone
+from functools import reduce
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Comment, PostScore
+
+EPOCH = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def log_weight(moment):
+    return (
+        (moment - EPOCH).total_seconds() / settings.POPULAR_HALF_LIFE_SECONDS
+    )
+
+
+def log_add(a, b):
+    high, low = max(a, b), min(a, b)
+    return high + math.log2(1 + 2 ** (low - high))
+
+
+def add_comment(post_id, created_at):
+    add_comments(post_id, [created_at])
+
+
+def add_comments(post_id, moments):
+    weight = reduce(log_add, map(log_weight, moments))
+    with transaction.atomic():
+        score, created = PostScore.objects.select_for_update().get_or_create(
+            post_id=post_id, defaults={"score": weight}
+        )
+        if not created:
+            score.score = log_add(score.score, weight)
+            score.save(update_fields=["score"])
+
+
+def remove_comment(post_id, created_at):
+    weight = log_weight(created_at)
+    with transaction.atomic():
+        score = (
+            PostScore.objects.select_for_update()
+            .filter(post_id=post_id)
+            .first()
+        )
+        if score is None:
+            return
+        # Погрешность float: последний комментарий удаляет строку целиком.
+        if weight - score.score > -1e-9:
+            score.delete()
+        else:
+            score.score += math.log2(1 - 2 ** (weight - score.score))
+            score.save(update_fields=["score"])
+
+
+def threshold(now=None):
+    """Рейтинг, ниже которого пост выпадает из списка популярных."""
+    return log_weight(now or timezone.now()) + math.log2(
+        settings.POPULAR_MIN_WEIGHT
+    )
+
+
+def prune(now=None):
+    return PostScore.objects.filter(score__lt=threshold(now)).delete()[0]
+
+
+def horizon(now):
+    # Комментарии старше этого момента не поднимают пост выше порога.
+    return now - timedelta(
+        seconds=settings.POPULAR_HALF_LIFE_SECONDS
+        * -math.log2(settings.POPULAR_MIN_WEIGHT)
+    )
+
+
+def rebuild(batch_size=5000):
+    """Пересчитывает рейтинг по комментариям, например после bulk_create."""
+    now = timezone.now()
+    rows = (
+        Comment.objects.filter(created_at__gte=horizon(now))
+        .exclude(post_id=None)
+        .order_by("post_id")
+        .values_list("post_id", "created_at")
+    )
+    scores = {}
+    for post_id, created_at in rows.iterator(chunk_size=batch_size):
+        weight = log_weight(created_at)
+        scores[post_id] = (
+            log_add(scores[post_id], weight) if post_id in scores else weight
+        )
+    with transaction.atomic():
+        PostScore.objects.all().delete()
+        PostScore.objects.bulk_create(
+            (
+                PostScore(post_id=post_id, score=score)
+                for post_id, score in scores.items()
+            ),
+            batch_size=batch_size,
+        )
+    return prune(now)
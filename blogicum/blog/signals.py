@@ -0,0 +1,247 @@
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+from django.db.models.signals import (
+    post_delete, post_save, pre_delete, pre_save,
+)
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+
+from blogicum.auth import forget_user
+
+from . import api, archive, popularity, sitemaps, stats, visibility
+from .cache import bump_feed_version, bump_version
+from .models import (
+    AuthorStats, Category, Comment, CommentActivity, Location, Post,
+    PostActivity,
+)
+
+User = get_user_model()
+
+# Отложенный пост стал виден: pub_date наступила (run_publication_scheduler).
+# Аргументы: post.
+post_published = Signal()
+
+
+# Видимость пересчитывается раньше, чем сбрасываются кэши ниже.
+@receiver(pre_save, sender=Post)
+def compute_post_visibility(sender, instance, **kwargs):
+    instance.is_visible = visibility.is_visible(instance)
+
+
+@receiver(pre_save, sender=Category)
+def remember_category_state(sender, instance, **kwargs):
+    instance._was_published = (
+        Category.objects.filter(pk=instance.pk)
+        .values_list("is_published", flat=True)
+        .first()
+    ) if instance.pk else None
+
+
+@receiver(post_save, sender=Category)
+def sync_category_visibility(sender, instance, created, **kwargs):
+    if not created and instance._was_published != instance.is_published:
+        visibility.sync_category(instance.pk, instance.is_published)
+        stats.rebuild(category_authors(instance.pk))
+        archive.rebuild()
+
+
+@receiver(pre_delete, sender=Category)
+def hide_deleted_category_posts(sender, instance, **kwargs):
+    # После удаления у постов category_id станет NULL.
+    visibility.sync_category(instance.pk, published=False)
+    stats.rebuild(category_authors(instance.pk))
+    archive.rebuild()
+
+
+def category_authors(category_id):
+    return list(
+        Post.objects.filter(category_id=category_id)
+        .order_by("author_id")
+        .values_list("author_id", flat=True)
+        .distinct()
+    )
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_feeds(sender, **kwargs):
+    bump_feed_version()
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_api(sender, update_fields=None, **kwargs):
+    # Вход пользователя меняет только last_login: его в API нет.
+    if update_fields and set(update_fields) <= {"last_login"}:
+        return
+    bump_version(api.API_VERSION)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_sitemap(sender, instance, **kwargs):
+    sitemaps.invalidate_object("posts", instance.pk)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_sitemap(sender, instance, **kwargs):
+    sitemaps.invalidate_object("categories", instance.pk)
+    # Снятие категории с публикации скрывает её посты во всех сегментах.
+    sitemaps.invalidate_section("posts")
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_profile_sitemap(sender, instance, update_fields=None,
+                               **kwargs):
+    if update_fields and set(update_fields) <= {"last_login"}:
+        return
+    sitemaps.invalidate_object("profiles", instance.pk)
+
+
+@receiver(post_save, sender=Post)
+def touch_post_updated(sender, instance, **kwargs):
+    now = timezone.now()
+    PostActivity.objects.update_or_create(
+        post_id=instance.pk,
+        defaults={"updated_at": now, "last_activity_at": now},
+    )
+
+
+@receiver(post_save, sender=Comment)
+def touch_comment_updated(sender, instance, **kwargs):
+    CommentActivity.objects.update_or_create(
+        comment_id=instance.pk, defaults={"updated_at": timezone.now()}
+    )
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def touch_post_activity(sender, instance, **kwargs):
+    # update() вместо post.save(): узкая строка, без сигналов поста.
+    # Строку не создаём: при каскадном удалении поста её уже нет.
+    PostActivity.objects.filter(post_id=instance.post_id).update(
+        last_activity_at=timezone.now()
+    )
+    if instance.post_id is not None:
+        sitemaps.invalidate_object("posts", instance.post_id)
+
+
+@receiver(pre_save, sender=User)
+def remember_username(sender, instance, **kwargs):
+    instance._stored_username = (
+        User.objects.filter(pk=instance.pk)
+        .values_list("username", flat=True)
+        .first()
+    ) if instance.pk else None
+
+
+@receiver(post_save, sender=User)
+def touch_renamed_user_posts(sender, instance, created, **kwargs):
+    # Имя автора поста и комментаторов выводится на странице поста:
+    # после переименования её Last-Modified и ETag должны смениться.
+    if created or instance._stored_username == instance.username:
+        return
+    PostActivity.objects.filter(
+        Q(post__author=instance) | Q(post__comments__author=instance)
+    ).update(last_activity_at=timezone.now())
+
+
+@receiver(post_published)
+def invalidate_published_post(sender, post, **kwargs):
+    bump_feed_version()
+    bump_version(api.API_VERSION)
+    sitemaps.invalidate_object("posts", post.pk)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    forget_user(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def create_author_stats(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        AuthorStats.objects.get_or_create(author=instance)
+
+
+# Сохранённые автор, дата и категория поста: одним запросом для
+# статистики авторов и архива.
+@receiver(pre_save, sender=Post)
+def remember_stored_post(sender, instance, **kwargs):
+    instance._stored = (
+        Post.objects.filter(pk=instance.pk)
+        .values_list("author_id", "pub_date", "category_id")
+        .first()
+    ) if instance.pk else None
+
+
+@receiver(post_save, sender=Post)
+def refresh_saved_post_author_stats(sender, instance, **kwargs):
+    stats.refresh_posts(instance.author_id)
+    # Пост передан другому автору: счётчики прежнего тоже меняются.
+    if instance._stored:
+        author_id, _, _ = instance._stored
+        if author_id != instance.author_id:
+            stats.refresh_posts(author_id)
+
+
+@receiver(post_delete, sender=Post)
+def refresh_deleted_post_author_stats(sender, instance, **kwargs):
+    stats.refresh_posts(instance.author_id)
+
+
+@receiver(post_save, sender=Comment)
+def count_new_comment(sender, instance, created, **kwargs):
+    if created:
+        stats.add_comments(instance.author_id, 1)
+        popularity.add_comment(instance.post_id, instance.created_at)
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(sender, instance, **kwargs):
+    stats.add_comments(instance.author_id, -1)
+    if instance.post_id is not None:
+        popularity.remove_comment(instance.post_id, instance.created_at)
+
+
+@receiver(post_published)
+def count_published_post(sender, post, **kwargs):
+    stats.refresh_posts(post.author_id)
+
+
+@receiver(post_save, sender=Post)
+def refresh_saved_post_archive(sender, instance, **kwargs):
+    dates = [instance.pub_date]
+    category_ids = [instance.category_id]
+    if instance._stored:
+        _, pub_date, category_id = instance._stored
+        dates.append(pub_date)
+        category_ids.append(category_id)
+    archive.refresh(map(archive.month_of, dates), category_ids)
+
+
+@receiver(post_delete, sender=Post)
+def refresh_deleted_post_archive(sender, instance, **kwargs):
+    archive.refresh(
+        [archive.month_of(instance.pub_date)], [instance.category_id]
+    )
+
+
+@receiver(post_published)
+def count_published_post_in_archive(sender, post, **kwargs):
+    archive.refresh([archive.month_of(post.pub_date)], [post.category_id])
@@ -0,0 +1,168 @@
+"""Карта сайта: индекс и сегменты по диапазонам первичных ключей.
+
+Сегмент раздела содержит объекты с pk из ((n - 1) * S, n * S], где S —
+SITEMAP_SEGMENT_SIZE, и выбирается по индексу без OFFSET. Готовый
+сегмент хранится в кэше; при изменении объекта сбрасывается только его
+сегмент (blog.signals), при изменениях, затрагивающих весь раздел, —
+версия раздела.
+"""
+import hashlib
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Max
+from django.http import Http404, HttpResponse
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+
+from .cache import bump_version, get_version
+from .models import Category, Post
+from .views import filter_published
+
+User = get_user_model()
+
+# Подставляется вместо схемы и домена: сегменты в кэше не зависят от хоста.
+BASE_URL_PLACEHOLDER = "__sitemap_base_url__"
+
+
+class PostSection:
+    model = Post
+
+    def entries(self, low, high):
+        rows = (
+            filter_published(Post.objects)
+            .filter(pk__gt=low, pk__lte=high)
+            .order_by("pk")
+            .values_list(
+                "pk", "pub_date", "activity__updated_at",
+                "activity__last_activity_at",
+            )
+        )
+        for pk, *dates in rows.iterator():
+            yield (
+                reverse("blog:post_detail", args=[pk]),
+                max(filter(None, dates)),
+            )
+
+
+class CategorySection:
+    model = Category
+
+    def entries(self, low, high):
+        rows = (
+            Category.objects.filter(
+                is_published=True, pk__gt=low, pk__lte=high
+            )
+            .order_by("pk")
+            .values_list("slug", "updated_at")
+        )
+        for slug, updated_at in rows.iterator():
+            yield reverse("blog:category_posts", args=[slug]), updated_at
+
+
+class ProfileSection:
+    model = User
+
+    def entries(self, low, high):
+        rows = (
+            User.objects.filter(is_active=True, pk__gt=low, pk__lte=high)
+            .order_by("pk")
+            .values_list("username", flat=True)
+        )
+        for username in rows.iterator():
+            yield reverse("blog:profile", args=[username]), None
+
+
+SECTIONS = {
+    "posts": PostSection(),
+    "categories": CategorySection(),
+    "profiles": ProfileSection(),
+}
+
+
+def segment_of(pk):
+    return (pk - 1) // settings.SITEMAP_SEGMENT_SIZE + 1
+
+
+def segment_key(section, segment):
+    version = get_version(f"sitemap-{section}")
+    return f"blog:sitemap:{section}:{version}:{segment}"
+
+
+def segment_count(section):
+    max_pk = SECTIONS[section].model.objects.aggregate(Max("pk"))["pk__max"]
+    return segment_of(max_pk) if max_pk else 0
+
+
+def build_segment(section, segment):
+    size = settings.SITEMAP_SEGMENT_SIZE
+    entries = list(
+        SECTIONS[section].entries((segment - 1) * size, segment * size)
+    )
+    lastmods = [lastmod for _, lastmod in entries if lastmod]
+    content = render_to_string("blog/sitemap.xml", {
+        "base_url": BASE_URL_PLACEHOLDER,
+        "entries": entries,
+    }).encode()
+    return content, max(lastmods) if lastmods else None
+
+
+def get_segment(section, segment):
+    key = segment_key(section, segment)
+    cached = cache.get(key)
+    if cached is None:
+        cached = build_segment(section, segment)
+        cache.set(key, cached, settings.SITEMAP_CACHE_SECONDS)
+    return cached
+
+
+def invalidate_object(section, pk):
+    cache.delete(segment_key(section, segment_of(pk)))
+
+
+def invalidate_section(section):
+    bump_version(f"sitemap-{section}")
+
+
+def xml_response(request, content):
+    base_url = f"{request.scheme}://{request.get_host()}".encode()
+    content = content.replace(BASE_URL_PLACEHOLDER.encode(), base_url)
+    etag = f'"{hashlib.md5(content).hexdigest()}"'
+    response = HttpResponse(content, content_type="application/xml")
+    response["ETag"] = etag
+    return get_conditional_response(request, etag=etag, response=response)
+
+
+def index(request):
+    segments = [
+        (section, segment)
+        for section in SECTIONS
+        for segment in range(1, segment_count(section) + 1)
+    ]
+    # Даты изменения известны только для уже собранных сегментов.
+    keys = {
+        segment_key(section, segment): (section, segment)
+        for section, segment in segments
+    }
+    cached = {keys[key]: value for key, value in cache.get_many(keys).items()}
+    content = render_to_string("blog/sitemap_index.xml", {
+        "base_url": BASE_URL_PLACEHOLDER,
+        "segments": [
+            (
+                reverse("blog:sitemap_segment", args=[section, segment]),
+                cached[(section, segment)][1]
+                if (section, segment) in cached else None,
+            )
+            for section, segment in segments
+        ],
+    }).encode()
+    return xml_response(request, content)
+
+
+def segment_view(request, section, segment):
+    if section not in SECTIONS or not 1 <= segment <= segment_count(section):
+        raise Http404("Нет такого раздела карты сайта.")
+    content, _ = get_segment(section, segment)
+    return xml_response(request, content)
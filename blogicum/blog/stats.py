@@ -0,0 +1,84 @@
+"""Материализованная статистика авторов: AuthorStats.
+
+Профиль читает одну строку по первичному ключу вместо COUNT по всем
+постам и комментариям. Комментарии меняют счётчик на ±1; посты
+пересчитываются по индексу author_id — так учитываются снятие с
+публикации и смена даты. Опубликованным считается пост, видимый в ленте
+(is_visible и pub_date в прошлом): отложенные посты засчитываются по
+сигналу post_published.
+"""
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, F, Max, Q
+from django.utils import timezone
+
+from .models import AuthorStats, Comment, Post
+
+User = get_user_model()
+
+
+def post_counts(author_ids):
+    published = Q(is_visible=True, pub_date__lte=timezone.now())
+    rows = (
+        Post.objects.filter(author_id__in=author_ids)
+        .order_by()
+        .values("author_id")
+        .annotate(
+            total_posts=Count("pk"),
+            published_posts=Count("pk", filter=published),
+            last_post_at=Max("pub_date", filter=published),
+        )
+    )
+    return {row.pop("author_id"): row for row in rows}
+
+
+def comment_counts(author_ids):
+    rows = (
+        Comment.objects.filter(author_id__in=author_ids)
+        .order_by()
+        .values("author_id")
+        .annotate(comments=Count("pk"))
+        .values_list("author_id", "comments")
+    )
+    return dict(rows)
+
+
+def refresh_posts(author_id):
+    """Пересчитывает счётчики постов в существующей строке автора.
+
+    Строку не создаём: при каскадном удалении автора её уже нет.
+    """
+    counts = post_counts([author_id]).get(author_id, {
+        "total_posts": 0, "published_posts": 0, "last_post_at": None,
+    })
+    AuthorStats.objects.filter(author_id=author_id).update(**counts)
+
+
+def add_comments(author_id, delta):
+    stats = AuthorStats.objects.filter(author_id=author_id)
+    if delta < 0:
+        stats = stats.filter(comments__gte=-delta)
+    stats.update(comments=F("comments") + delta)
+
+
+def rebuild(author_ids, batch_size=500):
+    """Пересоздаёт строки авторов целиком, например после bulk_create."""
+    iterator = iter(author_ids)
+    while batch := list(islice(iterator, batch_size)):
+        batch = list(
+            User.objects.filter(pk__in=batch).values_list("pk", flat=True)
+        )
+        posts = post_counts(batch)
+        comments = comment_counts(batch)
+        with transaction.atomic():
+            AuthorStats.objects.filter(author_id__in=batch).delete()
+            AuthorStats.objects.bulk_create(
+                AuthorStats(
+                    author_id=author_id,
+                    comments=comments.get(author_id, 0),
+                    **posts.get(author_id, {}),
+                )
+                for author_id in batch
+            )
@@ -1,26 +1,106 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import feeds, sitemaps, views
 
 
 app_name = "blog"
 
+if settings.ASYNC_READ_VIEWS:
+    from . import async_views
+
+    post_list = async_views.post_list
+    profile = async_views.profile
+    category_posts = async_views.category_posts
+    post_detail = async_views.post_detail
+else:
+    post_list = views.PostListView.as_view()
+    profile = views.UserProfileView.as_view()
+    category_posts = views.CategoryListView.as_view()
+    post_detail = views.post_detail
+
 urlpatterns = [
-    path("", views.PostListView.as_view(), name="index"),
+    path("", post_list, name="index"),
+    path(
+        "popular/", views.PopularPostListView.as_view(), name="popular"
+    ),
+    path(
+        "archive/<int:year>/",
+        views.ArchiveYearView.as_view(),
+        name="archive_year",
+    ),
+    path(
+        "archive/<int:year>/<int:month>/",
+        views.ArchiveMonthView.as_view(),
+        name="archive_month",
+    ),
+    path("rss/", feeds.latest_posts_rss, name="feed"),
+    path("atom/", feeds.latest_posts_atom, name="feed_atom"),
+    path("sitemap.xml", sitemaps.index, name="sitemap"),
+    path(
+        "sitemap-<str:section>-<int:segment>.xml",
+        sitemaps.segment_view,
+        name="sitemap_segment",
+    ),
     path(
         "profile/edit/", views.ProfileEditView.as_view(), name="edit_profile"
     ),
     path(
         "profile/<str:username>/",
-        views.UserProfileView.as_view(),
+        profile,
         name="profile",
     ),
+    path(
+        "profile/<str:username>/rss/",
+        feeds.author_posts_rss,
+        name="profile_feed",
+    ),
+    path(
+        "profile/<str:username>/atom/",
+        feeds.author_posts_atom,
+        name="profile_feed_atom",
+    ),
     path(
         "category/<slug:category_slug>/",
-        views.CategoryListView.as_view(),
+        category_posts,
         name="category_posts",
     ),
+    path(
+        "category/<slug:category_slug>/archive/<int:year>/",
+        views.ArchiveYearView.as_view(),
+        name="category_archive_year",
+    ),
+    path(
+        "category/<slug:category_slug>/archive/<int:year>/<int:month>/",
+        views.ArchiveMonthView.as_view(),
+        name="category_archive_month",
+    ),
+    path(
+        "category/<slug:category_slug>/rss/",
+        feeds.category_posts_rss,
+        name="category_feed",
+    ),
+    path(
+        "category/<slug:category_slug>/atom/",
+        feeds.category_posts_atom,
+        name="category_feed_atom",
+    ),
+    path(
+        "location/<int:location_id>/",
+        views.LocationListView.as_view(),
+        name="location_posts",
+    ),
+    path(
+        "location/<int:location_id>/rss/",
+        feeds.location_posts_rss,
+        name="location_feed",
+    ),
+    path(
+        "location/<int:location_id>/atom/",
+        feeds.location_posts_atom,
+        name="location_feed_atom",
+    ),
     path("posts/create/", views.PostCreateView.as_view(), name="create_post"),
-    path("posts/<int:post_id>/", views.post_detail, name="post_detail"),
+    path("posts/<int:post_id>/", post_detail, name="post_detail"),
     path(
         "posts/<int:post_id>/comment/",
         views.comment_create,
@@ -1,16 +1,26 @@
+import hashlib
+
+from django.core.cache import cache
 from django.db.models import Count
 from django.http import Http404
+from django.utils.functional import cached_property
 from django.views import generic
 from django.conf import settings
 from django.utils import timezone
 from django.shortcuts import render, get_object_or_404, redirect
 from django.urls import reverse_lazy
-from django.db.models import Q
 from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.decorators import login_required
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+from django.utils.decorators import method_decorator
+from django.views.decorators.vary import vary_on_cookie
+from blogicum.ratelimit import ratelimit
+from . import archive, comment_queue, popularity
 from .form import PostForm, CommentForm, CustomUserChangeForm
-from .models import Post, Category, Comment
+from .cache import feed_key
+from .models import Post, Category, Comment, Location, PostScore
 
 
 User = get_user_model()
@@ -22,15 +32,111 @@ def get_annotated_posts(queryset):
     )
 
 
+def filter_published(queryset):
+    # is_visible = опубликованы пост и категория (blog.visibility).
+    return queryset.filter(is_visible=True, pub_date__lte=timezone.now())
+
+
 def get_published_posts(object):
-    current_time = timezone.now()
     return get_annotated_posts(
-        object.filter(
-            Q(is_published=True)
-            & Q(pub_date__lte=current_time)
-            & Q(category__is_published=True)
-        ).select_related("author", "location", "category")
+        filter_published(object).select_related(
+            "author", "location", "category"
+        )
+    )
+
+
+def get_profile_posts(profile, user):
+    if user == profile:
+        return get_annotated_posts(
+            Post.objects.filter(author=profile).select_related(
+                "author", "location", "category"
+            )
+        )
+    return get_published_posts(Post.objects).filter(author=profile)
+
+
+def get_post_for_user(post_id, user):
+    post = get_object_or_404(
+        Post.objects.select_related("author", "location", "category"),
+        pk=post_id,
     )
+    if post.author != user:
+        if not post.is_published or not post.category.is_published:
+            raise Http404("Публикация недоступна!")
+        elif post.pub_date > timezone.now():
+            raise Http404("Данная запись еще не опубликована!")
+    return post
+
+
+def get_post_detail_validators(request, post_id):
+    """Валидаторы ETag и Last-Modified страницы поста одним запросом.
+
+    Для недоступного пользователю поста возвращает (None, None): ответ
+    404 формирует сама view. Результат запоминается в запросе.
+    """
+    if hasattr(request, "_post_detail_validators"):
+        return request._post_detail_validators
+    post = (
+        Post.objects.filter(pk=post_id)
+        .values(
+            "author_id", "is_published", "pub_date", "created_at",
+            "activity__updated_at", "activity__last_activity_at",
+            "author__username",
+            "category__is_published", "category__updated_at",
+            "location__updated_at",
+        )
+        .first()
+    )
+    user = request.user
+    validators = (None, None)
+    if post is not None and (post["author_id"] == user.pk or (
+        post["is_published"]
+        and post["category__is_published"]
+        and post["pub_date"] <= timezone.now()
+    )):
+        # Страница зависит от пользователя (ссылки правки, форма с CSRF)
+        # и от версии развёртывания (адреса статики).
+        key = repr((
+            settings.DEPLOY_VERSION,
+            user.pk,
+            request.COOKIES.get(settings.CSRF_COOKIE_NAME),
+            sorted(post.items()),
+            comment_queue.session_entries(request, post_id),
+        ))
+        validators = (
+            hashlib.md5(key.encode()).hexdigest(),
+            max(filter(None, (
+                post["created_at"],
+                post["activity__updated_at"],
+                post["activity__last_activity_at"],
+                post["category__updated_at"],
+                post["location__updated_at"],
+            ))),
+        )
+    request._post_detail_validators = validators
+    return validators
+
+
+def post_detail_etag(request, post_id):
+    return get_post_detail_validators(request, post_id)[0]
+
+
+def post_detail_last_modified(request, post_id):
+    return get_post_detail_validators(request, post_id)[1]
+
+
+def get_published_category(category_slug):
+    category = get_object_or_404(Category, slug=category_slug)
+    if not category.is_published:
+        raise Http404("Категория не публикуется!")
+    return category
+
+
+def get_published_location(location_id):
+    location = get_object_or_404(Location, pk=location_id)
+    if not location.is_published:
+        raise Http404("Местоположение не публикуется!")
+    return location
 
 
 class PostModelMixin(LoginRequiredMixin):
@@ -46,14 +152,29 @@ class PostModelMixin(LoginRequiredMixin):
 
 
 class DispatchPostMixin(PostModelMixin):
+    """Объект загружается один раз: в dispatch для проверки автора.
+
+    Повторные вызовы get_object() из UpdateView/DeleteView берут его
+    из self._object, автор сравнивается по author_id без запроса User.
+    """
+
     def get_success_url(self):
         return reverse_lazy(
             "blog:post_detail", kwargs={"post_id": self.kwargs["post_id"]}
         )
 
+    def fetch_object(self):
+        return get_object_or_404(
+            Post.objects.select_related("location"), pk=self.kwargs["post_id"]
+        )
+
+    def get_object(self, queryset=None):
+        if not hasattr(self, "_object"):
+            self._object = self.fetch_object()
+        return self._object
+
     def dispatch(self, request, *args, **kwargs):
-        post = self.get_object()
-        if request.user != post.author:
+        if self.get_object().author_id != request.user.pk:
             return redirect("blog:post_detail", post_id=kwargs["post_id"])
         return super().dispatch(request, *args, **kwargs)
 
@@ -62,8 +183,12 @@ class CommentBaseMixin(DispatchPostMixin):
     model = Comment
     template_name = "blog/comment.html"
 
-    def get_object(self, queryset=None):
-        return get_object_or_404(Comment, pk=self.kwargs["comment_id"])
+    def fetch_object(self):
+        return get_object_or_404(
+            Comment,
+            pk=self.kwargs["comment_id"],
+            post_id=self.kwargs["post_id"],
+        )
 
 
 class UserProfileView(generic.ListView):
@@ -73,17 +198,13 @@ class UserProfileView(generic.ListView):
 
     @property
     def get_user(self):
-        return get_object_or_404(User, username=self.kwargs["username"])
+        return get_object_or_404(
+            User.objects.select_related("stats"),
+            username=self.kwargs["username"],
+        )
 
     def get_queryset(self):
-        current_user = self.get_user
-        if self.request.user == current_user:
-            return get_annotated_posts(
-                Post.objects.filter(author=current_user).select_related(
-                    "author", "location", "category"
-                )
-            )
-        return get_published_posts(Post.objects).filter(author=current_user)
+        return get_profile_posts(self.get_user, self.request.user)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -114,6 +235,7 @@ class PostDeleteView(DispatchPostMixin, generic.DeleteView):
         return reverse_lazy("blog:index")
 
 
+@method_decorator(ratelimit("post"), name="post")
 class PostCreateView(PostModelMixin, generic.CreateView):
     def form_valid(self, form):
         form.instance.author = self.request.user
@@ -131,18 +253,66 @@ class PostListView(generic.ListView):
     paginate_by = settings.PAGINATOR_MAIN_PAGE
     queryset = get_published_posts(Post.objects)
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["archive"] = archive.months()
+        return context
+
+
+class PopularPostListView(generic.ListView):
+    model = PostScore
+    context_object_name = "post_list"
+    template_name = "blog/popular.html"
+    paginate_by = settings.PAGINATOR_MAIN_PAGE
+
+    def get_queryset(self):
+        # Обход индекса PostScore.score; комментарии считаются только
+        # для постов текущей страницы.
+        return (
+            PostScore.objects.filter(
+                score__gte=popularity.threshold(),
+                post__is_visible=True,
+                post__pub_date__lte=timezone.now(),
+            )
+            .select_related(
+                "post__author", "post__location", "post__category"
+            )
+            .order_by("-score")
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        # Страница рейтинга превращается в посты: page_obj, object_list и
+        # post_list шаблона содержат Post, а не PostScore.
+        paginator, page, scores, is_paginated = super().paginate_queryset(
+            queryset, page_size
+        )
+        posts = [score.post for score in scores]
+        counts = dict(
+            Comment.objects.filter(post__in=posts)
+            .order_by()
+            .values("post_id")
+            .annotate(count=Count("pk"))
+            .values_list("post_id", "count")
+        )
+        for post in posts:
+            post.comment_count = counts.get(post.pk, 0)
+        page.object_list = posts
+        return paginator, page, posts, is_paginated
+
 
+@vary_on_cookie
+@cache_control(private=True, no_cache=True)
+@condition(
+    etag_func=post_detail_etag, last_modified_func=post_detail_last_modified
+)
 def post_detail(request, post_id):
     template_name = "blog/detail.html"
-    post = get_object_or_404(Post, pk=post_id)
+    post = get_post_for_user(post_id, request.user)
     comment_form = CommentForm(request.POST)
-    current_time = timezone.now()
-    if post.author != request.user:
-        if not post.is_published or not post.category.is_published:
-            raise Http404("Публикация недоступна!")
-        elif post.pub_date > current_time:
-            raise Http404("Данная запись еще не опубликована!")
-    comments = post.comments.all()
+    comments = [
+        *post.comments.select_related("author"),
+        *comment_queue.pending_for(request, post),
+    ]
     context = {"post": post, "comments": comments, "form": comment_form}
     return render(request, template_name, context)
 
@@ -156,15 +326,18 @@ class CommentDeleteView(CommentBaseMixin, generic.DeleteView):
 
 
 @login_required
+@ratelimit("comment")
 def comment_create(request, post_id):
     post = get_object_or_404(Post, pk=post_id)
     form = CommentForm(request.POST)
     if form.is_valid():
-        comment = form.save(commit=False)
-        comment.author = request.user
-        comment.post = post
-        comment.save()
-        post.save()
+        if settings.COMMENT_BUFFERING:
+            comment_queue.enqueue(request, post, form.cleaned_data["text"])
+        else:
+            comment = form.save(commit=False)
+            comment.author = request.user
+            comment.post = post
+            comment.save()
     return redirect("blog:post_detail", post_id=post_id)
 
 
@@ -174,15 +347,100 @@ class CategoryListView(generic.ListView):
     paginate_by = settings.PAGINATOR_CATEGORY_PAGE
 
     def get_category(self):
-        return get_object_or_404(Category, slug=self.kwargs["category_slug"])
+        return get_published_category(self.kwargs["category_slug"])
 
     def get_queryset(self):
-        category = self.get_category()
-        if not category.is_published:
-            raise Http404("Категория не публикуется!")
-        return get_published_posts(category.posts)
+        return get_published_posts(self.get_category().posts)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["category"] = self.get_category()
+        context["archive"] = archive.months(context["category"])
+        return context
+
+
+class LocationListView(generic.ListView):
+    model = Post
+    template_name = "blog/location.html"
+    paginate_by = settings.PAGINATOR_CATEGORY_PAGE
+
+    @cached_property
+    def location(self):
+        return get_published_location(self.kwargs["location_id"])
+
+    def get_queryset(self):
+        # Выборка по индексу (location, pub_date).
+        return get_published_posts(self.location.posts)
+
+    def get_paginator(self, queryset, *args, **kwargs):
+        # COUNT(*) по месту кэшируется до изменения ленты (blog.cache).
+        paginator = super().get_paginator(queryset, *args, **kwargs)
+        paginator.count = cache.get_or_set(
+            feed_key("location-count", self.location.pk),
+            lambda: queryset.order_by().count(),
+            settings.FEED_CACHE_SECONDS,
+        )
+        return paginator
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["location"] = self.location
+        return context
+
+
+class ArchiveMixin:
+    @cached_property
+    def category(self):
+        slug = self.kwargs.get("category_slug")
+        return get_published_category(slug) if slug else None
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["category"] = self.category
+        context["year"] = self.kwargs["year"]
+        return context
+
+
+class ArchiveYearView(ArchiveMixin, generic.TemplateView):
+    template_name = "blog/archive_year.html"
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["months"] = archive.months(self.category, self.kwargs["year"])
+        if not context["months"]:
+            raise Http404("За этот год публикаций нет.")
+        return context
+
+
+class ArchiveMonthView(ArchiveMixin, generic.ListView):
+    model = Post
+    template_name = "blog/archive_month.html"
+    paginate_by = settings.PAGINATOR_MAIN_PAGE
+
+    def get_queryset(self):
+        try:
+            posts = archive.published_in(
+                self.kwargs["year"], self.kwargs["month"]
+            )
+        except ValueError:
+            raise Http404("Такого месяца нет.")
+        if self.category:
+            posts = posts.filter(category=self.category)
+        return get_annotated_posts(
+            posts.select_related("author", "location", "category")
+        )
+
+    def get_paginator(self, *args, **kwargs):
+        # Число постов берём из MonthlyPostCount вместо COUNT(*).
+        paginator = super().get_paginator(*args, **kwargs)
+        paginator.count = archive.month_count(
+            self.kwargs["year"], self.kwargs["month"], self.category
+        )
+        return paginator
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["month"] = archive.month_bounds(
+            self.kwargs["year"], self.kwargs["month"]
+        )[0]
         return context
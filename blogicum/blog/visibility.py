@@ -0,0 +1,56 @@
+"""Денормализованный флаг Post.is_visible.
+
+Пост виден, если опубликованы и он сам, и его категория. Флаг хранится в
+посте, чтобы ленты фильтровали по индексу (is_visible, pub_date) без
+соединения с категорией. Проверка pub_date остаётся в запросах: она
+зависит от текущего времени.
+"""
+from django.conf import settings
+from django.db.models import Q
+
+from .models import Category, Post
+
+
+def is_visible(post):
+    # Категория читается из базы: объект в памяти может быть устаревшим.
+    return post.is_published and Category.objects.filter(
+        pk=post.category_id, is_published=True
+    ).exists()
+
+
+def update_in_chunks(queryset, **values):
+    """UPDATE порциями по pk: блокировки записи остаются короткими."""
+    chunk_size = settings.VISIBILITY_CHUNK_SIZE
+    last_pk = 0
+    updated = 0
+    while True:
+        pks = list(
+            queryset.filter(pk__gt=last_pk)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:chunk_size]
+        )
+        if not pks:
+            return updated
+        updated += Post.objects.filter(pk__in=pks).update(**values)
+        last_pk = pks[-1]
+
+
+def sync_category(category_id, published):
+    posts = Post.objects.filter(category_id=category_id)
+    if published:
+        return update_in_chunks(
+            posts.filter(is_published=True, is_visible=False),
+            is_visible=True,
+        )
+    return update_in_chunks(posts.filter(is_visible=True), is_visible=False)
+
+
+def refresh(posts):
+    """Пересчитывает флаг для постов, записанных в обход сигналов."""
+    visible = Q(is_published=True, category__is_published=True)
+    update_in_chunks(
+        posts.filter(is_visible=True).exclude(visible), is_visible=False
+    )
+    update_in_chunks(
+        posts.filter(visible, is_visible=False), is_visible=True
+    )
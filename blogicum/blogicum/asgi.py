@@ -9,8 +9,16 @@ https://docs.djangoproject.com/en/3.2/howto/deployment/asgi/
 
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "blogicum.settings")
+# Под ASGI страницы только для чтения обслуживаются асинхронными view.
+os.environ.setdefault("BLOGICUM_ASYNC_VIEWS", "1")
 
 application = get_asgi_application()
+
+if settings.TEMPLATE_WARMUP:
+    from .warmup import warm_templates
+
+    warm_templates()
@@ -0,0 +1,42 @@
+from asgiref.sync import sync_to_async
+from django.core.paginator import InvalidPage, Paginator
+from django.http import Http404
+from django.shortcuts import render
+
+
+def paginate(queryset, request, per_page):
+    """Синхронная часть пагинации: страница вычисляется целиком."""
+    paginator = Paginator(queryset, per_page)
+    page_number = request.GET.get("page") or 1
+    if page_number == "last":
+        page_number = paginator.num_pages
+    try:
+        page = paginator.page(int(page_number))
+    except (ValueError, InvalidPage):
+        raise Http404("Страница не найдена!")
+    page.object_list = list(page.object_list)
+    return {
+        "paginator": paginator,
+        "page_obj": page,
+        "is_paginated": page.has_other_pages(),
+        "object_list": page.object_list,
+    }
+
+
+def _load_user(request):
+    return request.user.is_authenticated
+
+
+async def resolve_user(request):
+    """Загружает ленивый request.user одним переходом в поток."""
+    await sync_to_async(_load_user)(request)
+
+
+async def render_async(request, template_name, context=None, status=None):
+    """Рендерит шаблон в цикле событий после загрузки пользователя.
+
+    Все обращения к базе должны быть выполнены заранее: шаблоны получают
+    только материализованные данные.
+    """
+    await resolve_user(request)
+    return render(request, template_name, context, status=status)
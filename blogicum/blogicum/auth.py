@@ -0,0 +1,44 @@
+"""Пользователь сессии из кэша вместо запроса к auth_user.
+
+Копия пользователя хранится USER_CACHE_SECONDS и сбрасывается при каждом
+сохранении (правка профиля, смена пароля, вход) и удалении — см.
+blog.signals. Сброс виден всем воркерам, только если кэш общий: с
+локальным кэшем процесса (locmem) другие воркеры держали бы старый хэш
+пароля и is_active, и смена пароля не завершала бы их сессии. Поэтому
+без общего кэша (кроме DEBUG — там процесс один) пользователь читается
+из базы, как в ModelBackend.
+"""
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+PROCESS_LOCAL_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+def user_key(user_id):
+    return f"blogicum:user:{user_id}"
+
+
+def forget_user(user_id):
+    cache.delete(user_key(user_id))
+
+
+def cache_is_shared():
+    backend = settings.CACHES["default"]["BACKEND"]
+    return settings.DEBUG or backend not in PROCESS_LOCAL_CACHES
+
+
+class CachedModelBackend(ModelBackend):
+    def get_user(self, user_id):
+        if not cache_is_shared():
+            return super().get_user(user_id)
+        key = user_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, settings.USER_CACHE_SECONDS)
+        return user
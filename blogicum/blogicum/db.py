@@ -0,0 +1,45 @@
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+
+@lru_cache(maxsize=None)
+def execute_wrappers():
+    return [
+        import_string(path) for path in settings.DATABASE_EXECUTE_WRAPPERS
+    ]
+
+
+@receiver(setting_changed)
+def reset_execute_wrappers(setting, **kwargs):
+    if setting == "DATABASE_EXECUTE_WRAPPERS":
+        previous = execute_wrappers()
+        execute_wrappers.cache_clear()
+        for connection in connections.all():
+            connection.execute_wrappers[:] = [
+                wrapper for wrapper in connection.execute_wrappers
+                if wrapper not in previous
+            ]
+            install_execute_wrappers(None, connection)
+
+
+@receiver(connection_created)
+def install_execute_wrappers(sender, connection, **kwargs):
+    """Подключает обёртки DATABASE_EXECUTE_WRAPPERS к соединению.
+
+    Обёртки живут на объекте соединения своего потока, поэтому ставятся
+    при каждом создании соединения, а не на время запроса.
+    """
+    for wrapper in execute_wrappers():
+        if wrapper not in connection.execute_wrappers:
+            connection.execute_wrappers.append(wrapper)
+
+
+def install_on_existing_connections():
+    for connection in connections.all():
+        install_execute_wrappers(None, connection)
@@ -0,0 +1,209 @@
+"""Метрики запросов: число SQL-запросов, время в базе, шаблонах и всего.
+
+Состояние текущего запроса хранится в contextvar, поэтому учитываются и
+запросы из потоков sync_to_async. Агрегаты живут в памяти процесса: при
+нескольких воркерах каждый отдаёт свои метрики.
+"""
+import threading
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.template.backends.django import DjangoTemplates, Template
+
+DURATION_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+_current = ContextVar("blogicum_request_metrics", default=None)
+
+
+class RequestMetrics:
+    __slots__ = ("request", "started", "queries", "db_time",
+                 "template_time", "rendering")
+
+    def __init__(self, request):
+        self.request = request
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.rendering = False
+
+    @property
+    def duration(self):
+        return time.perf_counter() - self.started
+
+    @property
+    def view_name(self):
+        match = self.request.resolver_match
+        return match.view_name if match else "<unresolved>"
+
+
+def start_request(request):
+    return _current.set(RequestMetrics(request))
+
+
+def finish_request(token):
+    _current.reset(token)
+
+
+def current():
+    return _current.get()
+
+
+def count_query(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.db_time += time.perf_counter() - started
+
+
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        metrics = _current.get()
+        if metrics is None or metrics.rendering:
+            return super().render(context, request)
+        metrics.rendering = True
+        started = time.perf_counter()
+        db_time = metrics.db_time
+        try:
+            return super().render(context, request)
+        finally:
+            metrics.rendering = False
+            # Ленивые запросы из шаблона уже учтены во времени базы.
+            metrics.template_time += (
+                time.perf_counter() - started - (metrics.db_time - db_time)
+            )
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """DjangoTemplates с замером времени рендеринга; задаётся в TEMPLATES."""
+
+    def from_string(self, template_code):
+        template = super().from_string(template_code)
+        return TimedTemplate(template.template, self)
+
+    def get_template(self, template_name):
+        template = super().get_template(template_name)
+        return TimedTemplate(template.template, self)
+
+
+class ViewStats:
+    def __init__(self):
+        self.count = 0
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.duration = 0.0
+        self.buckets = [0] * len(DURATION_BUCKETS)
+
+
+class Registry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.views = {}
+
+    def observe(self, view_name, metrics, duration):
+        with self.lock:
+            stats = self.views.setdefault(view_name, ViewStats())
+            stats.count += 1
+            stats.queries += metrics.queries
+            stats.db_time += metrics.db_time
+            stats.template_time += metrics.template_time
+            stats.duration += duration
+            for index, bound in enumerate(DURATION_BUCKETS):
+                if duration <= bound:
+                    stats.buckets[index] += 1
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                name: (stats.count, stats.queries, stats.db_time,
+                       stats.template_time, stats.duration,
+                       list(stats.buckets))
+                for name, stats in self.views.items()
+            }
+
+    def reset(self):
+        with self.lock:
+            self.views.clear()
+
+
+registry = Registry()
+
+# Поставщики дополнительных строк для /metrics: функции без аргументов,
+# возвращающие список строк в текстовом формате Prometheus.
+extra_collectors = []
+
+
+def _series(lines, name, kind, help_text, samples):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {kind}")
+    for labels, value in samples:
+        lines.append(f"{name}{{{labels}}} {value}")
+
+
+def render_prometheus():
+    snapshot = sorted(registry.snapshot().items())
+    lines = []
+
+    def label(view):
+        return 'view="{}"'.format(view.replace('"', '\\"'))
+
+    _series(lines, "blogicum_requests_total", "counter",
+            "Обработанные запросы.",
+            [(label(view), row[0]) for view, row in snapshot])
+    _series(lines, "blogicum_db_queries_total", "counter",
+            "SQL-запросы, выполненные при обработке.",
+            [(label(view), row[1]) for view, row in snapshot])
+    _series(lines, "blogicum_db_seconds_total", "counter",
+            "Время выполнения SQL-запросов.",
+            [(label(view), f"{row[2]:.6f}") for view, row in snapshot])
+    _series(lines, "blogicum_template_seconds_total", "counter",
+            "Время рендеринга шаблонов без учёта SQL.",
+            [(label(view), f"{row[3]:.6f}") for view, row in snapshot])
+    lines.append("# HELP blogicum_request_duration_seconds "
+                 "Полное время обработки запроса.")
+    lines.append("# TYPE blogicum_request_duration_seconds histogram")
+    for view, (count, _, _, _, duration, buckets) in snapshot:
+        for bound, value in zip(DURATION_BUCKETS, buckets):
+            lines.append(
+                "blogicum_request_duration_seconds_bucket"
+                f'{{{label(view)},le="{bound}"}} {value}'
+            )
+        lines.append(
+            "blogicum_request_duration_seconds_bucket"
+            f'{{{label(view)},le="+Inf"}} {count}'
+        )
+        lines.append(
+            f"blogicum_request_duration_seconds_sum{{{label(view)}}} "
+            f"{duration:.6f}"
+        )
+        lines.append(
+            f"blogicum_request_duration_seconds_count{{{label(view)}}} "
+            f"{count}"
+        )
+    for collector in extra_collectors:
+        lines.extend(collector())
+    return "\n".join(lines) + "\n"
+
+
+def check_access(request):
+    user = getattr(request, "user", None)
+    if request.META.get("REMOTE_ADDR") not in settings.METRICS_ALLOWED_IPS:
+        if user is None or not user.is_staff:
+            raise Http404
+
+
+def metrics_view(request):
+    check_access(request)
+    return HttpResponse(
+        render_prometheus(), content_type="text/plain; version=0.0.4"
+    )
@@ -0,0 +1,249 @@
+import asyncio
+import mimetypes
+import threading
+import time
+from pathlib import Path
+from urllib.parse import unquote
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.http import FileResponse
+from django.utils.cache import patch_cache_control, patch_vary_headers
+
+from . import db, metrics, profiling, routers
+
+
+class BaseMiddleware:
+    """Middleware, работающая без адаптации и под WSGI, и под ASGI.
+
+    Наследники реализуют before(request) и after(request, response, state).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = asyncio.iscoroutinefunction(get_response)
+        if self.is_async:
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def before(self, request):
+        return None
+
+    def after(self, request, response, state):
+        return response
+
+    def finish(self, request, state):
+        pass
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        state = self.before(request)
+        try:
+            response = self.get_response(request)
+            response = self.after(request, response, state)
+        finally:
+            self.finish(request, state)
+        return response
+
+    async def __acall__(self, request):
+        state = self.before(request)
+        try:
+            response = await self.get_response(request)
+            response = self.after(request, response, state)
+        finally:
+            self.finish(request, state)
+        return response
+
+
+class RequestMetricsMiddleware(BaseMiddleware):
+    """Учитывает SQL, шаблоны и общее время запроса по имени view.
+
+    Итог отдаётся клиенту в заголовке Server-Timing и накапливается
+    для /metrics.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        db.install_on_existing_connections()
+
+    def before(self, request):
+        return metrics.start_request(request)
+
+    def after(self, request, response, state):
+        request_metrics = metrics.current()
+        duration = request_metrics.duration
+        metrics.registry.observe(
+            request_metrics.view_name, request_metrics, duration
+        )
+        if settings.SERVER_TIMING_HEADER:
+            response["Server-Timing"] = (
+                f"db;dur={request_metrics.db_time * 1000:.1f};"
+                f'desc="{request_metrics.queries} queries", '
+                f"tpl;dur={request_metrics.template_time * 1000:.1f}, "
+                f"total;dur={duration * 1000:.1f}"
+            )
+        return response
+
+    def finish(self, request, state):
+        metrics.finish_request(state)
+
+
+class ProfilingMiddleware(BaseMiddleware):
+    """Снимает стеки для выборки запросов, если включён PROFILING."""
+
+    def before(self, request):
+        if not profiling.should_sample():
+            return None
+        thread_id = threading.get_ident()
+        return thread_id, profiling.sampler.start(thread_id)
+
+    def finish(self, request, state):
+        if state is None:
+            return
+        thread_id, samples = state
+        profiling.sampler.stop(thread_id)
+        match = request.resolver_match
+        if match and samples:
+            profiling.profiles.add(match.view_name, samples)
+
+
+class ReplicaPinningMiddleware(BaseMiddleware):
+    """Закрепляет клиента за основной базой на время после записи."""
+
+    cookie_name = "db_pinned_until"
+
+    def pinned_until(self, request):
+        try:
+            return float(request.COOKIES.get(self.cookie_name, 0))
+        except ValueError:
+            return 0
+
+    def before(self, request):
+        return routers.start_request(self.pinned_until(request) > time.time())
+
+    def after(self, request, response, state):
+        if routers.has_written() and settings.DATABASE_REPLICAS:
+            pin_seconds = settings.REPLICA_PIN_SECONDS
+            response.set_cookie(
+                self.cookie_name,
+                str(time.time() + pin_seconds),
+                max_age=pin_seconds,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+    def finish(self, request, state):
+        routers.finish_request(state)
+
+
+def accepted_encodings(header, codings):
+    """Кодировки из codings, которые Accept-Encoding разрешает (q > 0)."""
+    weights = {}
+    for item in header.split(","):
+        coding, *params = (part.strip() for part in item.split(";"))
+        if not coding:
+            continue
+        weight = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding.lower()] = weight
+    wildcard = weights.get("*", 0.0)
+    return {
+        coding for coding in codings if weights.get(coding, wildcard) > 0
+    }
+
+
+class StaticFilesMiddleware(BaseMiddleware):
+    """Отдаёт собранную статику, выбирая заранее сжатый вариант файла.
+
+    Файлы с хэшем в имени кэшируются браузером навсегда (immutable),
+    остальные — на STATIC_MAX_AGE секунд.
+    """
+
+    encodings = (("br", ".br"), ("gzip", ".gz"))
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.root = Path(settings.STATIC_ROOT).resolve()
+        self.prefix = settings.STATIC_URL
+        self.hashed_names = set(
+            getattr(staticfiles_storage, "hashed_files", {}).values()
+        )
+        self.files = {}
+
+    def find(self, name):
+        if name in self.files:
+            return self.files[name]
+        path = (self.root / name).resolve()
+        if self.root not in path.parents or not path.is_file():
+            return None
+        variants = {None: path}
+        for encoding, suffix in self.encodings:
+            variant = path.with_name(path.name + suffix)
+            if variant.is_file():
+                variants[encoding] = variant
+        self.files[name] = variants
+        return variants
+
+    def serve(self, request):
+        if request.method not in ("GET", "HEAD"):
+            return None
+        if not request.path.startswith(self.prefix):
+            return None
+        name = unquote(request.path[len(self.prefix):])
+        variants = self.find(name)
+        if variants is None:
+            return None
+        accepted = accepted_encodings(
+            request.META.get("HTTP_ACCEPT_ENCODING", ""),
+            variants.keys() - {None},
+        )
+        encoding = next(
+            (encoding for encoding, _ in self.encodings
+             if encoding in accepted),
+            None,
+        )
+        path = variants[encoding]
+        response = FileResponse(path.open("rb"))
+        # Статика показывается браузером, а не скачивается файлом .gz.
+        del response["Content-Disposition"]
+        content_type, _ = mimetypes.guess_type(name)
+        response["Content-Type"] = (
+            content_type or "application/octet-stream"
+        )
+        if encoding:
+            response["Content-Encoding"] = encoding
+        if len(variants) > 1:
+            patch_vary_headers(response, ("Accept-Encoding",))
+        if name in self.hashed_names:
+            response["Cache-Control"] = (
+                "public, max-age=31536000, immutable"
+            )
+        else:
+            patch_cache_control(
+                response, public=True, max_age=settings.STATIC_MAX_AGE
+            )
+        return response
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        response = self.serve(request)
+        if response is None:
+            response = self.get_response(request)
+        return response
+
+    async def __acall__(self, request):
+        response = self.serve(request)
+        if response is None:
+            response = await self.get_response(request)
+        return response
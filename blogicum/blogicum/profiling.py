@@ -0,0 +1,143 @@
+"""Выборочный профилировщик запросов для боевого окружения.
+
+Для доли PROFILING["SAMPLE_RATE"] запросов фоновый поток раз в
+PROFILING["INTERVAL"] секунд снимает стек потока, обрабатывающего запрос.
+Стеки копятся по имени view в свёрнутом формате (collapsed stacks),
+который понимают flamegraph.pl и speedscope; скачать их может персонал
+в админке: /admin/profiling/.
+
+Под ASGI снимается стек потока, в котором работает middleware, то есть
+цикла событий: асинхронные view видны, синхронный код в пуле потоков — нет.
+"""
+import random
+import sys
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.contrib import admin
+from django.http import Http404, HttpResponse
+from django.template.response import TemplateResponse
+
+OTHER_STACKS = "[прочие стеки]"
+
+
+def collapse(frame):
+    names = []
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "?")
+        names.append(f"{module}:{frame.f_code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class Sampler:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = {}
+        self.wakeup = threading.Event()
+        self.thread = None
+
+    def start(self, thread_id):
+        samples = Counter()
+        with self.lock:
+            self.active[thread_id] = samples
+            if self.thread is None:
+                self.thread = threading.Thread(
+                    target=self.run, name="blogicum-profiler", daemon=True
+                )
+                self.thread.start()
+        self.wakeup.set()
+        return samples
+
+    def stop(self, thread_id):
+        with self.lock:
+            self.active.pop(thread_id, None)
+
+    def run(self):
+        while True:
+            if not self.active:
+                self.wakeup.wait()
+                self.wakeup.clear()
+                continue
+            frames = sys._current_frames()
+            with self.lock:
+                for thread_id, samples in self.active.items():
+                    frame = frames.get(thread_id)
+                    if frame is not None:
+                        samples[collapse(frame)] += 1
+            del frames
+            time.sleep(settings.PROFILING["INTERVAL"])
+
+
+class Profiles:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.views = {}
+        self.requests = Counter()
+
+    def add(self, view_name, samples):
+        max_stacks = settings.PROFILING["MAX_STACKS"]
+        with self.lock:
+            stacks = self.views.setdefault(view_name, Counter())
+            self.requests[view_name] += 1
+            for stack, count in samples.items():
+                if stack in stacks or len(stacks) < max_stacks:
+                    stacks[stack] += count
+                else:
+                    stacks[OTHER_STACKS] += count
+
+    def summary(self):
+        with self.lock:
+            return sorted(
+                (view, self.requests[view], sum(stacks.values()))
+                for view, stacks in self.views.items()
+            )
+
+    def collapsed(self, view_name):
+        with self.lock:
+            stacks = self.views.get(view_name)
+            if stacks is None:
+                return None
+            return "".join(
+                f"{stack} {count}\n" for stack, count in stacks.most_common()
+            )
+
+    def reset(self):
+        with self.lock:
+            self.views.clear()
+            self.requests.clear()
+
+
+sampler = Sampler()
+profiles = Profiles()
+
+
+def should_sample():
+    options = settings.PROFILING
+    return options["ENABLED"] and random.random() < options["SAMPLE_RATE"]
+
+
+def index_view(request):
+    if request.method == "POST":
+        profiles.reset()
+    context = {
+        **admin.site.each_context(request),
+        "title": "Профилирование",
+        "views": profiles.summary(),
+        "options": settings.PROFILING,
+    }
+    return TemplateResponse(request, "admin/profiling.html", context)
+
+
+def download_view(request, view_name):
+    collapsed = profiles.collapsed(view_name)
+    if collapsed is None:
+        raise Http404("Для этой view нет профиля.")
+    response = HttpResponse(collapsed, content_type="text/plain")
+    filename = view_name.replace(":", "-")
+    response["Content-Disposition"] = (
+        f'attachment; filename="{filename}.folded"'
+    )
+    return response
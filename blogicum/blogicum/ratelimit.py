@@ -0,0 +1,103 @@
+"""Ограничение частоты записи: token bucket на пользователя и на IP.
+
+Ведро вмещает N запросов и пополняется со скоростью N за S секунд
+(RATE_LIMITS[name] = (N, S)). Состояние хранится в общем кэше; если кэш
+недоступен, — в памяти процесса: лимит остаётся, но считается отдельно
+в каждом воркере; там хранится не больше LOCAL_MAX_BUCKETS вёдер, и
+каждое живёт S секунд, как в кэше. Чтение и запись состояния не
+атомарны, так что при одновременных запросах лимит приблизительный.
+
+За обратным прокси REMOTE_ADDR — адрес прокси; RATE_LIMIT_IP_HEADER
+называет заголовок, куда прокси пишет адрес клиента.
+"""
+import math
+import threading
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.shortcuts import render
+
+LOCAL_MAX_BUCKETS = 10000
+
+# Ключ -> (момент истечения, состояние) в порядке записи.
+_local = {}
+_local_lock = threading.Lock()
+
+
+def _load(keys):
+    try:
+        return cache.get_many(keys)
+    except Exception:
+        now = time.time()
+        with _local_lock:
+            return {
+                key: _local[key][1] for key in keys
+                if key in _local and _local[key][0] > now
+            }
+
+
+def _store(states, timeout):
+    try:
+        cache.set_many(states, timeout)
+    except Exception:
+        expires = time.time() + timeout
+        with _local_lock:
+            for key, state in states.items():
+                _local.pop(key, None)
+                _local[key] = (expires, state)
+            # Вытесняем вёдра, которые дольше всех не обновлялись.
+            while len(_local) > LOCAL_MAX_BUCKETS:
+                del _local[next(iter(_local))]
+
+
+def client_ip(request):
+    header = settings.RATE_LIMIT_IP_HEADER
+    if header and request.META.get(header):
+        # Последний адрес в списке дописал ближайший доверенный прокси.
+        return request.META[header].split(",")[-1].strip()
+    return request.META.get("REMOTE_ADDR")
+
+
+def bucket_keys(request, name):
+    keys = [f"blogicum:ratelimit:{name}:ip:{client_ip(request)}"]
+    if request.user.is_authenticated:
+        keys.append(f"blogicum:ratelimit:{name}:user:{request.user.pk}")
+    return keys
+
+
+def take(keys, capacity, period):
+    """Берёт по жетону из каждого ведра; 0 или сколько секунд ждать."""
+    now = time.time()
+    rate = capacity / period
+    states = _load(keys)
+    tokens = {}
+    for key in keys:
+        left, updated = states.get(key, (capacity, now))
+        tokens[key] = min(capacity, left + (now - updated) * rate)
+    short = min(tokens.values())
+    if short < 1:
+        return (1 - short) / rate
+    _store({key: (left - 1, now) for key, left in tokens.items()}, period)
+    return 0
+
+
+def ratelimit(name, methods=("POST",)):
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method in methods:
+                capacity, period = settings.RATE_LIMITS[name]
+                wait = take(bucket_keys(request, name), capacity, period)
+                if wait:
+                    response = render(
+                        request, "pages/429.html", status=429
+                    )
+                    response["Retry-After"] = str(math.ceil(wait))
+                    return response
+            return view(request, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,52 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+
+PRIMARY_DB = "default"
+
+# Состояние хранится в изменяемом словаре, чтобы запись, сделанная в потоке
+# sync_to_async, была видна middleware в исходном контексте.
+_state = ContextVar("blogicum_db_state", default=None)
+
+
+def start_request(pinned):
+    return _state.set({"pinned": pinned, "wrote": False})
+
+
+def finish_request(token):
+    _state.reset(token)
+
+
+def has_written():
+    state = _state.get()
+    return bool(state and state["wrote"])
+
+
+def _mark_written():
+    state = _state.get()
+    if state is None:
+        _state.set({"pinned": True, "wrote": True})
+    else:
+        state["pinned"] = state["wrote"] = True
+
+
+class PrimaryReplicaRouter:
+    """Чтение с реплик, запись и всё после записи — с основной базы."""
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        state = _state.get()
+        if not replicas or (state and state["pinned"]):
+            return PRIMARY_DB
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        _mark_written()
+        return PRIMARY_DB
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == PRIMARY_DB
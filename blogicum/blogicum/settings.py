@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -46,6 +47,9 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "blogicum.middleware.RequestMetricsMiddleware",
+    "blogicum.middleware.ProfilingMiddleware",
+    "blogicum.middleware.ReplicaPinningMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -58,13 +62,42 @@ INTERNAL_IPS = [
     "127.0.0.1",
 ]
 
+# Метрики запросов: /metrics доступен с этих адресов и персоналу сайта.
+METRICS_ALLOWED_IPS = INTERNAL_IPS
+SERVER_TIMING_HEADER = True
+
+# Обёртки выполнения SQL, подключаемые к каждому соединению с базой.
+DATABASE_EXECUTE_WRAPPERS = [
+    "blogicum.metrics.count_query",
+    "blogicum.slow_queries.log_slow_query",
+]
+SLOW_QUERY_LOG = {
+    "ENABLED": True,
+    "THRESHOLD_MS": 100,
+    "EXPLAIN": True,
+    "MAX_FINGERPRINTS": 500,
+}
+
+# Выборочное профилирование запросов; результаты в /admin/profiling/.
+PROFILING = {
+    "ENABLED": os.getenv("BLOGICUM_PROFILING") == "1",
+    "SAMPLE_RATE": 0.01,
+    "INTERVAL": 0.005,
+    "MAX_STACKS": 5000,
+}
+
 ROOT_URLCONF = "blogicum.urls"
 
+# Асинхронные view для страниц только для чтения; включается в asgi.py.
+ASYNC_READ_VIEWS = os.getenv("BLOGICUM_ASYNC_VIEWS") == "1"
+
 TEMPLATES_DIR = BASE_DIR / "templates"
 
+# Бэкенд — DjangoTemplates с замером времени рендеринга для метрик.
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "BACKEND": "blogicum.metrics.TimedDjangoTemplates",
+        "NAME": "django",
         "DIRS": [TEMPLATES_DIR],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -78,6 +111,10 @@ TEMPLATES = [
     },
 ]
 
+# Компиляция всех шаблонов при старте wsgi/asgi-приложения, чтобы первые
+# запросы после деплоя не тратили время на разбор шаблонов.
+TEMPLATE_WARMUP = False
+
 WSGI_APPLICATION = "blogicum.wsgi.application"
 
 
@@ -91,6 +128,53 @@ DATABASES = {
     }
 }
 
+# Реплики только для чтения описываются дополнительными записями в DATABASES
+# и перечисляются здесь; после записи клиент читает с основной базы
+# ещё REPLICA_PIN_SECONDS секунд, чтобы сразу видеть свои изменения.
+DATABASE_REPLICAS = []
+DATABASE_ROUTERS = ["blogicum.routers.PrimaryReplicaRouter"]
+REPLICA_PIN_SECONDS = 10
+
+
+# Сессия и пользователь читаются из кэша: на запрос авторизованного
+# пользователя не приходится ни одного обращения к django_session и
+# auth_user. cached_db пишет сессию и в базу, так что вытеснение из кэша
+# не разлогинивает. Копия пользователя используется только с общим для
+# воркеров кэшем (blogicum.auth.cache_is_shared), иначе читается база. ModelBackend остаётся в списке, чтобы сессии,
+# открытые до перехода на кэш, продолжали работать.
+# Копия сбрасывается сигналами, поэтому массовые изменения в обход save()
+# (например, User.objects.update(is_active=False)) видны не сразу:
+# пользователь остаётся в кэше до USER_CACHE_SECONDS. После них вызывайте
+# blogicum.auth.forget_user для каждого затронутого пользователя.
+SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
+AUTHENTICATION_BACKENDS = [
+    "blogicum.auth.CachedModelBackend",
+    "django.contrib.auth.backends.ModelBackend",
+]
+USER_CACHE_SECONDS = 15 * 60
+
+
+# Ограничение частоты записи (blogicum.ratelimit): не больше N запросов
+# за S секунд с одного пользователя и с одного IP.
+RATE_LIMITS = {
+    "comment": (20, 60),
+    "post": (10, 60),
+}
+# Заголовок с адресом клиента от доверенного обратного прокси, например
+# "HTTP_X_FORWARDED_FOR" или "HTTP_X_REAL_IP". None — брать REMOTE_ADDR.
+# Включайте, только если прокси перезаписывает этот заголовок: иначе
+# клиент подставит в него любой адрес.
+RATE_LIMIT_IP_HEADER = None
+
+
+# Буферизованный приём комментариев (blog.comment_queue): comment_create
+# пишет в файловую очередь, в базу её переносит flush_comments.
+COMMENT_BUFFERING = os.getenv("BLOGICUM_COMMENT_BUFFERING") == "1"
+COMMENT_SPOOL_DIR = BASE_DIR / "comment_spool"
+# Сколько секунд автор видит свой комментарий из очереди; с запасом
+# больше интервала запуска flush_comments.
+COMMENT_PENDING_MAX_AGE = 60 * 60
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
@@ -133,6 +217,8 @@ STATIC_URL = "/static/"
 STATICFILES_DIRS = [
     BASE_DIR / "static_dev",
 ]
+STATIC_MAX_AGE = 60 * 60
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/3.2/ref/settings/#default-auto-field
 
@@ -150,4 +236,44 @@ PAGINATOR_PROFILE = 10
 PAGINATOR_MAIN_PAGE = 10
 PAGINATOR_CATEGORY_PAGE = 10
 
+# Кэш общий для всех воркеров только если это не locmem: в боевом
+# окружении задаётся адрес memcached (settings_production).
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+}
+
+FEED_ITEMS = 20
+FEED_CACHE_SECONDS = 5 * 60
+
+# Не больше 50 000 адресов в файле по протоколу sitemaps.org.
+SITEMAP_SEGMENT_SIZE = 10_000
+SITEMAP_CACHE_SECONDS = 60 * 60
+
+API_PAGE_SIZE = 20
+API_MAX_PAGE_SIZE = 100
+API_CACHE_SECONDS = 60
+
+# Размер порции UPDATE при пересчёте Post.is_visible.
+VISIBILITY_CHUNK_SIZE = 1000
+
+# Вклад комментария в популярность поста вдвое меньше каждые сутки;
+# посты, чей рейтинг упал ниже веса одного свежего комментария,
+# умноженного на POPULAR_MIN_WEIGHT, убирает decay_post_scores.
+# PostScore.score хранится в единицах периода полураспада: после смены
+# POPULAR_HALF_LIFE_SECONDS обязательно выполните
+# decay_post_scores --rebuild, иначе старые и новые строки несравнимы.
+POPULAR_HALF_LIFE_SECONDS = 24 * 60 * 60
+POPULAR_MIN_WEIGHT = 0.05
+
 MEDIA_ROOT = BASE_DIR / "media"
+
+# Версия развёртывания: меняется при каждом деплое и входит в ключи кэшей.
+DEPLOY_VERSION = os.getenv("BLOGICUM_DEPLOY_VERSION", "dev")
+
+# Каталог заранее отрендеренных страниц (manage.py prerender_pages);
+# пока не задан, статические страницы и страницы ошибок рендерятся на лету.
+PRERENDERED_PAGES_DIR = os.getenv("BLOGICUM_PRERENDERED_PAGES_DIR")
+STATIC_PAGES_MAX_AGE = 60 * 60
+NOT_FOUND_MAX_AGE = 60
@@ -0,0 +1,61 @@
+"""Настройки для боевого окружения.
+
+Запуск: DJANGO_SETTINGS_MODULE=blogicum.settings_production.
+"""
+
+from .settings import *  # noqa: F401,F403
+from .settings import BASE_DIR, MIDDLEWARE, SECRET_KEY, TEMPLATES, os
+
+DEBUG = False
+
+SECRET_KEY = os.getenv("BLOGICUM_SECRET_KEY", SECRET_KEY)
+
+ALLOWED_HOSTS = os.getenv(
+    "BLOGICUM_ALLOWED_HOSTS", "localhost,127.0.0.1"
+).split(",")
+
+# Шаблоны читаются и разбираются один раз на процесс и компилируются
+# заранее при старте приложения (blogicum.warmup).
+TEMPLATES = [
+    {
+        **TEMPLATES[0],
+        "APP_DIRS": False,
+        "OPTIONS": {
+            **TEMPLATES[0]["OPTIONS"],
+            "loaders": [
+                (
+                    "django.template.loaders.cached.Loader",
+                    [
+                        "django.template.loaders.filesystem.Loader",
+                        "django.template.loaders.app_directories.Loader",
+                    ],
+                ),
+            ],
+        },
+    },
+]
+TEMPLATE_WARMUP = True
+
+if os.getenv("BLOGICUM_MEMCACHED"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.memcached.PyMemcacheCache",
+            "LOCATION": os.getenv("BLOGICUM_MEMCACHED").split(","),
+        },
+    }
+else:
+    # Кэш у каждого воркера свой: выход из сессии на одном воркере не
+    # сбросил бы её копию на остальных.
+    SESSION_ENGINE = "django.contrib.sessions.backends.db"
+
+# Статика: collectstatic хэширует имена, оптимизирует PNG и сохраняет
+# .gz/.br копии, которые StaticFilesMiddleware отдаёт с immutable-кэшем.
+STATIC_ROOT = os.getenv("BLOGICUM_STATIC_ROOT", BASE_DIR / "static")
+STATICFILES_STORAGE = "blogicum.storage.CompressedManifestStaticFilesStorage"
+
+_security = MIDDLEWARE.index("django.middleware.security.SecurityMiddleware")
+MIDDLEWARE = [
+    *MIDDLEWARE[:_security + 1],
+    "blogicum.middleware.StaticFilesMiddleware",
+    *MIDDLEWARE[_security + 1:],
+]
@@ -0,0 +1,176 @@
+"""Журнал медленных SQL-запросов с планом выполнения.
+
+Обёртка log_slow_query подключается через DATABASE_EXECUTE_WRAPPERS.
+Запросы дольше SLOW_QUERY_LOG["THRESHOLD_MS"] пишутся в лог
+blogicum.slow_queries вместе с view, отпечатком и планом (EXPLAIN
+выполняется один раз на отпечаток) и агрегируются по отпечаткам.
+"""
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.http import HttpResponse
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+EXPLAIN_PREFIXES = {
+    "sqlite": "EXPLAIN QUERY PLAN ",
+    "postgresql": "EXPLAIN ",
+    "mysql": "EXPLAIN ",
+}
+
+_NORMALIZERS = (
+    (re.compile(r"'(?:[^']|'')*'"), "?"),
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),
+    (re.compile(r"%s"), "?"),
+    (re.compile(r"\bIN\s*\((?:\s*\?\s*,?)+\)", re.IGNORECASE), "IN (...)"),
+    (re.compile(r"\s+"), " "),
+)
+
+
+def normalize(sql):
+    for pattern, replacement in _NORMALIZERS:
+        sql = pattern.sub(replacement, sql)
+    return sql.strip()
+
+
+def fingerprint(sql):
+    normalized = normalize(sql)
+    return hashlib.sha1(normalized.encode()).hexdigest()[:12], normalized
+
+
+class QueryStats:
+    def __init__(self, normalized, sql):
+        self.normalized = normalized
+        self.sample_sql = sql
+        self.plan = None
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.views = Counter()
+
+
+class SlowQueryLog:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.queries = {}
+        self.dropped = 0
+
+    def record(self, key, normalized, sql, view_name, duration_ms):
+        """Учитывает запрос; возвращает статистику и признак первого раза."""
+        with self.lock:
+            stats = self.queries.get(key)
+            first = stats is None
+            if first:
+                if len(self.queries) >= settings.SLOW_QUERY_LOG[
+                    "MAX_FINGERPRINTS"
+                ]:
+                    self.dropped += 1
+                    return None, False
+                stats = self.queries[key] = QueryStats(normalized, sql)
+            stats.count += 1
+            stats.total_ms += duration_ms
+            stats.max_ms = max(stats.max_ms, duration_ms)
+            stats.views[view_name] += 1
+            return stats, first
+
+    def snapshot(self):
+        with self.lock:
+            return sorted(
+                self.queries.items(),
+                key=lambda item: item[1].total_ms,
+                reverse=True,
+            )
+
+    def reset(self):
+        with self.lock:
+            self.queries.clear()
+            self.dropped = 0
+
+
+slow_log = SlowQueryLog()
+
+
+def explain(connection, sql, params):
+    prefix = EXPLAIN_PREFIXES.get(connection.vendor)
+    if prefix is None or not sql.lstrip().upper().startswith("SELECT"):
+        return None
+    try:
+        # Курсор драйвера минует execute_wrappers: EXPLAIN не попадает
+        # ни в метрики, ни снова в этот журнал. Точка сохранения откатывает
+        # только ошибку EXPLAIN: в PostgreSQL она иначе прервала бы всю
+        # транзакцию запроса.
+        with transaction.atomic(using=connection.alias):
+            with connection.cursor() as cursor:
+                cursor.cursor.execute(prefix + sql, params)
+                rows = cursor.cursor.fetchall()
+    except DatabaseError as error:
+        return f"EXPLAIN не выполнен: {error}"
+    return "\n".join(" | ".join(str(value) for value in row) for row in rows)
+
+
+def log_slow_query(execute, sql, params, many, context):
+    options = settings.SLOW_QUERY_LOG
+    started = time.perf_counter()
+    result = execute(sql, params, many, context)
+    duration_ms = (time.perf_counter() - started) * 1000
+    if not options["ENABLED"] or duration_ms < options["THRESHOLD_MS"]:
+        return result
+
+    request_metrics = metrics.current()
+    view_name = request_metrics.view_name if request_metrics else "-"
+    key, normalized = fingerprint(sql)
+    stats, first = slow_log.record(
+        key, normalized, sql, view_name, duration_ms
+    )
+    if stats is not None and first and options["EXPLAIN"] and not many:
+        stats.plan = explain(context["connection"], sql, params)
+    logger.warning(
+        "Медленный запрос %.1f мс [%s] во view %s: %s%s",
+        duration_ms, key, view_name, normalized,
+        f"\n{stats.plan}" if first and stats and stats.plan else "",
+    )
+    return result
+
+
+def collect_prometheus():
+    lines = [
+        "# HELP blogicum_slow_queries_total Медленные запросы по отпечаткам.",
+        "# TYPE blogicum_slow_queries_total counter",
+    ]
+    for key, stats in slow_log.snapshot():
+        lines.append(
+            f'blogicum_slow_queries_total{{fingerprint="{key}"}} '
+            f"{stats.count}"
+        )
+    return lines
+
+
+metrics.extra_collectors.append(collect_prometheus)
+
+
+def report_view(request):
+    """Текстовый отчёт: самые дорогие по суммарному времени запросы."""
+    metrics.check_access(request)
+    blocks = []
+    for key, stats in slow_log.snapshot():
+        views = ", ".join(
+            f"{name} ×{count}" for name, count in stats.views.most_common()
+        )
+        blocks.append(
+            f"[{key}] {stats.count} раз, всего {stats.total_ms:.1f} мс, "
+            f"максимум {stats.max_ms:.1f} мс\n"
+            f"view: {views}\n{stats.normalized}\n"
+            f"план:\n{stats.plan or '—'}\n"
+        )
+    if slow_log.dropped:
+        blocks.append(f"Не учтено новых отпечатков: {slow_log.dropped}\n")
+    return HttpResponse("\n".join(blocks) or "Медленных запросов нет.\n",
+                        content_type="text/plain; charset=utf-8")
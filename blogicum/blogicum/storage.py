@@ -0,0 +1,65 @@
+import gzip
+from io import BytesIO
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from PIL import Image
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = (
+    ".css", ".js", ".svg", ".ico", ".json", ".txt", ".xml", ".html", ".map",
+)
+MIN_COMPRESS_SIZE = 256
+
+
+def optimize_png(path):
+    with open(path, "rb") as file:
+        original = file.read()
+    with Image.open(BytesIO(original)) as image:
+        buffer = BytesIO()
+        image.save(buffer, format="PNG", optimize=True)
+    if buffer.tell() < len(original):
+        with open(path, "wb") as file:
+            file.write(buffer.getvalue())
+
+
+def compressed_variants(content):
+    yield ".gz", gzip.compress(content, compresslevel=9, mtime=0)
+    if brotli is not None:
+        yield ".br", brotli.compress(content, quality=11)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Хэширует имена, оптимизирует PNG и сохраняет сжатые копии файлов.
+
+    PNG оптимизируются до хэширования, чтобы хэш соответствовал итоговому
+    содержимому. Рядом с каждым сжимаемым файлом кладутся .gz и, если
+    установлен пакет brotli, .br — их отдаёт StaticFilesMiddleware.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        if dry_run:
+            yield from super().post_process(paths, dry_run, **options)
+            return
+        for name in list(paths):
+            if name.lower().endswith(".png"):
+                optimize_png(self.path(name))
+                paths[name] = (self, name)
+        yield from super().post_process(paths, dry_run, **options)
+        for hashed_name in sorted(set(self.hashed_files.values())):
+            self.compress(hashed_name)
+
+    def compress(self, name):
+        if not name.lower().endswith(COMPRESSIBLE_EXTENSIONS):
+            return
+        with self.open(name) as file:
+            content = file.read()
+        if len(content) < MIN_COMPRESS_SIZE:
+            return
+        for suffix, compressed in compressed_variants(content):
+            if len(compressed) < len(content):
+                with open(self.path(name + suffix), "wb") as file:
+                    file.write(compressed)
@@ -4,12 +4,16 @@ from django.views.generic import CreateView
 from blog.form import CustomUserCreationForm
 from django.conf import settings
 from django.conf.urls.static import static
+from blogicum import profiling
+from blogicum.metrics import metrics_view
+from blogicum.slow_queries import report_view
 
 handler404 = "pages.views.page_not_found"
 handler500 = "pages.views.internal_server_err"
 
 urlpatterns = [
     path("", include("blog.urls", namespace="blog")),
+    path("api/v1/", include("blog.api_urls", namespace="api")),
     path("auth/", include("django.contrib.auth.urls")),
     path(
         "auth/registration/",
@@ -21,5 +25,17 @@ urlpatterns = [
         name="registration",
     ),
     path("pages/", include("pages.urls", namespace="pages")),
+    path(
+        "admin/profiling/",
+        admin.site.admin_view(profiling.index_view),
+        name="profiling",
+    ),
+    path(
+        "admin/profiling/<str:view_name>/",
+        admin.site.admin_view(profiling.download_view),
+        name="profiling_download",
+    ),
     path("admin/", admin.site.urls),
+    path("metrics/", metrics_view, name="metrics"),
+    path("metrics/slow-queries/", report_view, name="slow_queries"),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
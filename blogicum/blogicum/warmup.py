@@ -0,0 +1,51 @@
+import logging
+from pathlib import Path
+
+from django.template import TemplateSyntaxError, engines
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_SUFFIXES = (".html", ".txt", ".xml")
+
+
+def iter_loaders(loaders):
+    for loader in loaders:
+        yield loader
+        yield from iter_loaders(getattr(loader, "loaders", ()))
+
+
+def iter_template_names(engine):
+    seen = set()
+    for loader in iter_loaders(engine.template_loaders):
+        get_dirs = getattr(loader, "get_dirs", None)
+        if get_dirs is None:
+            continue
+        for directory in get_dirs():
+            directory = Path(directory)
+            for path in sorted(directory.rglob("*")):
+                if path.suffix not in TEMPLATE_SUFFIXES:
+                    continue
+                name = path.relative_to(directory).as_posix()
+                if name not in seen:
+                    seen.add(name)
+                    yield name
+
+
+def warm_templates():
+    """Компилирует все шаблоны, чтобы заполнить кэширующий загрузчик.
+
+    Возвращает число скомпилированных шаблонов.
+    """
+    compiled = 0
+    for backend in engines.all():
+        engine = getattr(backend, "engine", None)
+        if engine is None:
+            continue
+        for name in iter_template_names(engine):
+            try:
+                engine.get_template(name)
+            except TemplateSyntaxError as error:
+                logger.warning("Шаблон %s не скомпилирован: %s", name, error)
+            else:
+                compiled += 1
+    return compiled
@@ -9,8 +9,14 @@ https://docs.djangoproject.com/en/3.2/howto/deployment/wsgi/
 
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "blogicum.settings")
 
 application = get_wsgi_application()
+
+if settings.TEMPLATE_WARMUP:
+    from .warmup import warm_templates
+
+    warm_templates()
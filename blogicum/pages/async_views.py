@@ -0,0 +1,22 @@
+from django.conf import settings
+
+from blogicum.asyncutils import render_async, resolve_user
+from . import prerender
+
+
+async def static_page(request, template_name, prerendered_name):
+    await resolve_user(request)
+    response = prerender.serve(request, prerendered_name)
+    if response is None:
+        response = await render_async(request, template_name)
+    return prerender.add_caching_headers(
+        request, response, settings.STATIC_PAGES_MAX_AGE
+    )
+
+
+async def about(request):
+    return await static_page(request, "pages/about.html", "about")
+
+
+async def rules(request):
+    return await static_page(request, "pages/rules.html", "rules")
@@ -0,0 +1,53 @@
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand, CommandError
+from django.http import Http404
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+
+from pages import prerender, views
+
+
+class Command(BaseCommand):
+    help = (
+        "Рендерит статические страницы и страницы ошибок для анонимных "
+        "пользователей в PRERENDERED_PAGES_DIR/<DEPLOY_VERSION>/."
+    )
+
+    def make_request(self, path):
+        request = RequestFactory().get(
+            path, HTTP_HOST=(settings.ALLOWED_HOSTS or ["localhost"])[0]
+        )
+        request.user = AnonymousUser()
+        request.prerendering = True
+        return request
+
+    def render_page(self, url_name):
+        path = reverse(url_name)
+        request = self.make_request(path)
+        request.resolver_match = resolve(path)
+        return request.resolver_match.func(request)
+
+    def render_not_found(self):
+        request = self.make_request("/")
+        request.build_absolute_uri = (
+            lambda location=None: prerender.REQUEST_URL_PLACEHOLDER
+        )
+        return views.page_not_found(request, Http404())
+
+    def handle(self, *args, **options):
+        if not settings.PRERENDERED_PAGES_DIR:
+            raise CommandError("Не задана настройка PRERENDERED_PAGES_DIR.")
+        pages = {
+            "about": lambda: self.render_page("pages:about"),
+            "rules": lambda: self.render_page("pages:rules"),
+            "404": self.render_not_found,
+            "500": lambda: views.internal_server_err(self.make_request("/")),
+            "403csrf": lambda: views.csrf_failure(self.make_request("/")),
+        }
+        for name, render_page in pages.items():
+            response = render_page()
+            path = prerender.page_path(name)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(response.content)
+            self.stdout.write(f"{name}: {path}")
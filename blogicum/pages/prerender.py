@@ -0,0 +1,85 @@
+import hashlib
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+    set_response_etag,
+)
+from django.utils.html import escape
+
+# Подставляется вместо адреса запроса при пререндеринге страницы 404.
+REQUEST_URL_PLACEHOLDER = "__prerendered_request_url__"
+
+_pages = {}
+
+
+def page_path(name):
+    return (
+        Path(settings.PRERENDERED_PAGES_DIR)
+        / settings.DEPLOY_VERSION
+        / f"{name}.html"
+    )
+
+
+def load_page(name):
+    key = (settings.DEPLOY_VERSION, name)
+    if key not in _pages:
+        try:
+            content = page_path(name).read_bytes()
+        except FileNotFoundError:
+            _pages[key] = None
+        else:
+            etag = f'"{hashlib.md5(content).hexdigest()}"'
+            _pages[key] = (content, etag)
+    return _pages[key]
+
+
+def is_anonymous(request):
+    user = getattr(request, "user", None)
+    return user is None or not user.is_authenticated
+
+
+def serve(request, name, status=200):
+    """Ответ из заранее отрендеренной страницы или None.
+
+    Пререндеренные страницы отдаются только анонимным пользователям:
+    шапка сайта для авторизованных зависит от пользователя.
+    """
+    if (
+        not settings.PRERENDERED_PAGES_DIR
+        or getattr(request, "prerendering", False)
+        or not is_anonymous(request)
+    ):
+        return None
+    page = load_page(name)
+    if page is None:
+        return None
+    content, etag = page
+    placeholder = REQUEST_URL_PLACEHOLDER.encode()
+    if placeholder in content:
+        request_url = escape(request.build_absolute_uri()).encode()
+        return HttpResponse(content.replace(placeholder, request_url),
+                            status=status)
+    response = HttpResponse(content, status=status)
+    response["ETag"] = etag
+    return response
+
+
+def add_caching_headers(request, response, max_age):
+    """Проставляет ETag и Cache-Control, отвечает 304 при совпадении."""
+    if response.status_code != 200:
+        return response
+    if not response.has_header("ETag"):
+        set_response_etag(response)
+    patch_vary_headers(response, ("Cookie",))
+    if is_anonymous(request):
+        patch_cache_control(response, public=True, max_age=max_age)
+    else:
+        patch_cache_control(response, private=True, max_age=0)
+    return get_conditional_response(
+        request, etag=response["ETag"], response=response
+    )
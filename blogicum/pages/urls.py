@@ -1,9 +1,19 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
 app_name = "pages"
 
+if settings.ASYNC_READ_VIEWS:
+    from . import async_views
+
+    about = async_views.about
+    rules = async_views.rules
+else:
+    about = views.AboutView.as_view()
+    rules = views.RulesView.as_view()
+
 urlpatterns = [
-    path("about/", views.AboutView.as_view(), name="about"),
-    path("rules/", views.RulesView.as_view(), name="rules"),
+    path("about/", about, name="about"),
+    path("rules/", rules, name="rules"),
 ]
@@ -1,25 +1,55 @@
+from django.conf import settings
 from django.shortcuts import render
+from django.utils.cache import patch_cache_control
 from django.views.generic import TemplateView
 
+from . import prerender
 
-class AboutView(TemplateView):
+
+class StaticPageView(TemplateView):
+    prerendered_name = None
+
+    def get(self, request, *args, **kwargs):
+        response = prerender.serve(request, self.prerendered_name)
+        if response is None:
+            response = super().get(request, *args, **kwargs).render()
+        return prerender.add_caching_headers(
+            request, response, settings.STATIC_PAGES_MAX_AGE
+        )
+
+
+class AboutView(StaticPageView):
     template_name = "pages/about.html"
+    prerendered_name = "about"
 
 
-class RulesView(TemplateView):
+class RulesView(StaticPageView):
     template_name = "pages/rules.html"
+    prerendered_name = "rules"
 
 
 def page_not_found(request, exception):
-    template_name = "pages/404.html"
-    return render(request, template_name, status=404)
+    response = prerender.serve(request, "404", status=404)
+    if response is None:
+        template_name = "pages/404.html"
+        response = render(request, template_name, status=404)
+    if prerender.is_anonymous(request):
+        patch_cache_control(response, public=True,
+                            max_age=settings.NOT_FOUND_MAX_AGE)
+    return response
 
 
 def internal_server_err(request):
-    template_name = "pages/500.html"
-    return render(request, template_name, status=500)
+    response = prerender.serve(request, "500", status=500)
+    if response is None:
+        template_name = "pages/500.html"
+        response = render(request, template_name, status=500)
+    return response
 
 
 def csrf_failure(request, reason=""):
-    template_name = "pages/403csrf.html"
-    return render(request, template_name, status=403)
+    response = prerender.serve(request, "403csrf", status=403)
+    if response is None:
+        template_name = "pages/403csrf.html"
+        response = render(request, template_name, status=403)
+    return response
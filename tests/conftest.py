@@ -41,6 +41,14 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from django.core.cache import cache
+
+    cache.clear()
+    yield
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
@@ -97,6 +97,24 @@ def post_with_published_location(
     return post
 
 
+@pytest.fixture
+def make_published_posts(mixer: Mixer, user: Model, published_category):
+    """Создаёт count опубликованных постов автора user; поля можно задать."""
+    def make(count: int = N_PER_FIXTURE, **fields):
+        fields.setdefault("pub_date", timezone.now() - timedelta(days=1))
+        return mixer.cycle(count).blend(
+            "blog.Post", author=user, category=published_category,
+            is_published=True, **fields
+        )
+
+    return make
+
+
+@pytest.fixture
+def published_posts(make_published_posts):
+    return make_published_posts(5)
+
+
 @pytest.fixture
 def many_posts_with_published_locations(
     mixer: Mixer, user, published_locations, published_category
@@ -0,0 +1,49 @@
+import pytest
+
+
+@pytest.mark.django_db
+def test_post_list_cursor_pagination(client, published_posts):
+    seen = []
+    url = "/api/v1/posts/?limit=2&fields=id,title"
+    while url:
+        data = client.get(url).json()
+        assert all(set(item) == {"id", "title"} for item in data["results"])
+        seen.extend(item["id"] for item in data["results"])
+        url = data["next"]
+    assert sorted(seen) == sorted(post.pk for post in published_posts), (
+        "Убедитесь, что курсор обходит все публикации ровно один раз."
+    )
+    assert client.get("/api/v1/posts/?fields=nope").status_code == 400
+
+
+@pytest.mark.django_db
+def test_post_detail_visibility_and_etag(
+        client, user_client, published_posts, posts_with_unpublished_category
+):
+    hidden = posts_with_unpublished_category[0]
+    assert client.get(f"/api/v1/posts/{hidden.pk}/").status_code == 404
+    assert user_client.get(f"/api/v1/posts/{hidden.pk}/").status_code == 200, (
+        "Убедитесь, что автор видит свои скрытые публикации, как на сайте."
+    )
+
+    post = published_posts[0]
+    response = client.get(f"/api/v1/posts/{post.pk}/")
+    assert response.json()["comment_count"] == 0
+    response = client.get(
+        f"/api/v1/posts/{post.pk}/", HTTP_IF_NONE_MATCH=response["ETag"]
+    )
+    assert response.status_code == 304
+    assert client.get(f"/api/v1/posts/{post.pk}/comments/").json() == {
+        "results": [], "next": None,
+    }
+
+
+@pytest.mark.django_db
+def test_profile_cache_follows_user_changes(client, user):
+    url = f"/api/v1/profiles/{user.username}/"
+    assert client.get(url).json()["first_name"] == user.first_name
+    user.first_name = "Изменено"
+    user.save()
+    assert client.get(url).json()["first_name"] == "Изменено", (
+        "Убедитесь, что изменение пользователя сбрасывает кэш API."
+    )
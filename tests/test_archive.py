@@ -0,0 +1,61 @@
+from datetime import datetime
+
+import pytest
+from django.utils import timezone
+
+from blog.models import MonthlyPostCount
+
+
+def aware(*args):
+    return timezone.make_aware(datetime(*args))
+
+
+@pytest.fixture
+def archived_posts(make_published_posts):
+    return make_published_posts(
+        3, pub_date=(date for date in (aware(2024, 3, 5), aware(2024, 3, 20),
+                                       aware(2024, 5, 1))),
+    )
+
+
+def buckets(category=None):
+    return dict(
+        MonthlyPostCount.objects.filter(category=category)
+        .values_list("month", "count")
+    )
+
+
+@pytest.mark.django_db
+def test_buckets_follow_post_changes(archived_posts, published_category):
+    assert buckets() == {3: 2, 5: 1}
+    assert buckets(published_category) == {3: 2, 5: 1}
+    archived_posts[0].pub_date = aware(2024, 5, 2)
+    archived_posts[0].save()
+    assert buckets() == {3: 1, 5: 2}, (
+        "Убедитесь, что счётчики обоих месяцев пересчитываются при смене "
+        "даты публикации."
+    )
+    archived_posts[1].delete()
+    assert buckets() == {5: 2}
+    published_category.is_published = False
+    published_category.save()
+    assert buckets() == {}
+
+
+@pytest.mark.django_db
+def test_archive_pages(client, archived_posts, published_category):
+    response = client.get("/archive/2024/3/")
+    assert response.status_code == 200
+    assert response.context["paginator"].count == 2
+    assert {post.pk for post in response.context["page_obj"]} == {
+        post.pk for post in archived_posts[:2]
+    }
+    slug = published_category.slug
+    response = client.get(f"/category/{slug}/archive/2024/")
+    assert [count for _, count in response.context["months"]] == [1, 2]
+    assert client.get("/archive/2024/13/").status_code == 404
+    assert client.get("/archive/2023/").status_code == 404
+    response = client.get("/")
+    assert "/archive/2024/5/" in response.content.decode(), (
+        "Убедитесь, что на главной странице есть ссылки на архив."
+    )
@@ -0,0 +1,49 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import AnonymousUser
+from django.http import Http404
+from django.test import RequestFactory
+
+from blog import async_views
+from pages import async_views as pages_async_views
+
+
+def make_request(path, user=None):
+    request = RequestFactory().get(path)
+    request.user = user or AnonymousUser()
+    return request
+
+
+@pytest.mark.django_db
+def test_async_post_list(post_with_published_location):
+    response = async_to_sync(async_views.post_list)(make_request("/"))
+    assert response.status_code == 200
+    assert post_with_published_location.title in response.content.decode(), (
+        "Убедитесь, что асинхронная лента показывает опубликованные посты."
+    )
+
+
+@pytest.mark.django_db
+def test_async_post_detail_hides_unpublished(
+        post_with_published_location, another_user
+):
+    post_with_published_location.is_published = False
+    post_with_published_location.save()
+    request = make_request(f"/posts/{post_with_published_location.id}/",
+                           user=another_user)
+    with pytest.raises(Http404):
+        async_to_sync(async_views.post_detail)(
+            request, post_id=post_with_published_location.id
+        )
+    request.user = post_with_published_location.author
+    response = async_to_sync(async_views.post_detail)(
+        request, post_id=post_with_published_location.id
+    )
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_async_static_pages():
+    for view in (pages_async_views.about, pages_async_views.rules):
+        response = async_to_sync(view)(make_request("/pages/"))
+        assert response.status_code == 200
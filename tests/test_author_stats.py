@@ -0,0 +1,83 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.models import AuthorStats
+
+
+def stats_of(user):
+    return AuthorStats.objects.get(author=user)
+
+
+@pytest.mark.django_db
+def test_stats_follow_posts_and_comments(
+    mixer, make_published_posts, user, another_user, published_category
+):
+    now = timezone.now()
+    posts = make_published_posts(
+        3, pub_date=(date for date in (now - timedelta(days=2),
+                                       now - timedelta(days=1),
+                                       now + timedelta(days=1))),
+    )
+    stats = stats_of(user)
+    assert (stats.total_posts, stats.published_posts) == (3, 2), (
+        "Убедитесь, что отложенные посты не считаются опубликованными."
+    )
+    assert stats.last_post_at == posts[1].pub_date
+
+    comments = mixer.cycle(2).blend(
+        "blog.Comment", author=another_user, post=posts[0]
+    )
+    assert stats_of(another_user).comments == 2
+    comments[0].delete()
+    assert stats_of(another_user).comments == 1
+
+    published_category.is_published = False
+    published_category.save()
+    assert stats_of(user).published_posts == 0, (
+        "Убедитесь, что снятие категории с публикации обновляет статистику."
+    )
+    posts[0].delete()
+    assert stats_of(user).total_posts == 2
+    assert stats_of(another_user).comments == 0
+
+
+@pytest.mark.django_db
+def test_stats_follow_author_change(make_published_posts, user, another_user):
+    post, = make_published_posts(1)
+    post.author = another_user
+    post.save()
+    assert stats_of(user).total_posts == 0, (
+        "Убедитесь, что при смене автора обновляется статистика прежнего."
+    )
+    assert stats_of(another_user).total_posts == 1
+
+
+@pytest.mark.django_db
+def test_reconcile_fixes_drift(make_published_posts, user):
+    make_published_posts(2)
+    AuthorStats.objects.filter(author=user).update(
+        published_posts=0, total_posts=0
+    )
+    call_command("reconcile_author_stats", stdout=StringIO())
+    stats = stats_of(user)
+    assert (stats.total_posts, stats.published_posts) == (2, 2), (
+        "Убедитесь, что reconcile_author_stats пересчитывает статистику."
+    )
+
+
+@pytest.mark.django_db
+def test_profile_header_reads_stats_row(client, make_published_posts, user):
+    make_published_posts(2)
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(f"/profile/{user.username}/")
+    assert "Публикаций: 2" in response.content.decode()
+    assert any(
+        '"blog_authorstats"' in query["sql"] and '"auth_user"' in query["sql"]
+        for query in queries
+    ), "Убедитесь, что статистика читается вместе с пользователем."
@@ -0,0 +1,64 @@
+import pytest
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.fixture
+def shared_cache(tmp_path):
+    # Файловый кэш общий для процессов, в отличие от locmem.
+    with override_settings(CACHES={"default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": tmp_path / "cache",
+    }}):
+        yield
+
+
+def auth_queries(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == 200
+    return [
+        query["sql"] for query in queries
+        if '"django_session"' in query["sql"]
+        or query["sql"].startswith('SELECT "auth_user"')
+    ]
+
+
+@pytest.mark.django_db
+def test_session_and_user_come_from_cache(shared_cache, user_client, user):
+    url = "/pages/about/"
+    auth_queries(user_client, url)
+    assert auth_queries(user_client, url) == [], (
+        "Убедитесь, что сессия и пользователь читаются из кэша."
+    )
+    user.first_name = "Новое имя"
+    user.save()
+    assert auth_queries(user_client, url), (
+        "Убедитесь, что сохранение пользователя сбрасывает его копию в кэше."
+    )
+    assert user_client.get(url).wsgi_request.user.first_name == "Новое имя"
+
+
+@pytest.mark.django_db
+def test_password_change_logs_out_other_sessions(user_client, user):
+    user.set_password("new-secret-password")
+    user.save()
+    response = user_client.get("/pages/about/")
+    assert not response.wsgi_request.user.is_authenticated
+
+
+@pytest.mark.django_db
+def test_process_local_cache_reads_user_from_db(user_client, user):
+    url = "/pages/about/"
+    user_client.get(url)
+    # Пароль сменили на другом воркере: его сигнал сбросил копию в своём
+    # locmem, а в этом процессе сигнала не было.
+    type(user).objects.filter(pk=user.pk).update(
+        password=make_password("new-secret-password")
+    )
+    response = user_client.get(url)
+    assert not response.wsgi_request.user.is_authenticated, (
+        "Убедитесь, что без общего кэша пользователь читается из базы."
+    )
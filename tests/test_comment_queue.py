@@ -0,0 +1,77 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.test import override_settings
+
+from blog import comment_queue
+from blog.models import AuthorStats, Comment, PostScore
+
+
+@pytest.fixture
+def buffering(tmp_path):
+    with override_settings(
+        COMMENT_BUFFERING=True, COMMENT_SPOOL_DIR=tmp_path / "spool"
+    ):
+        yield tmp_path / "spool"
+
+
+def flush():
+    call_command("flush_comments", once=True, stdout=StringIO())
+
+
+@pytest.mark.django_db
+def test_buffered_comment_is_visible_to_author(
+    buffering, user, user_client, another_user_client,
+    post_with_published_location,
+):
+    post = post_with_published_location
+    url = f"/posts/{post.pk}/"
+    user_client.post(f"{url}comment/", data={"text": "Из очереди"})
+    assert not Comment.objects.exists()
+    assert "Из очереди" in user_client.get(url).content.decode(), (
+        "Убедитесь, что автор сразу видит свой комментарий из очереди."
+    )
+    assert "Из очереди" not in another_user_client.get(url).content.decode()
+
+    flush()
+    comment = Comment.objects.get()
+    assert (comment.author, comment.post, comment.text) == (
+        user, post, "Из очереди"
+    )
+    assert AuthorStats.objects.get(author=user).comments == 1
+    assert PostScore.objects.filter(post=post).exists()
+    assert not list(buffering.glob("*.jsonl"))
+    content = user_client.get(url).content.decode()
+    assert content.count("Из очереди") == 1
+    assert "ожидает публикации" not in content
+
+
+@pytest.mark.django_db
+def test_flush_skips_already_saved_records(
+    buffering, user_client, post_with_published_location
+):
+    url = f"/posts/{post_with_published_location.pk}/comment/"
+    user_client.post(url, data={"text": "Первый"})
+    pending = buffering / "pending.jsonl"
+    # Имитируем сбой после сохранения: тот же файл остаётся в очереди.
+    saved_copy = pending.read_bytes()
+    flush()
+    (buffering / "processing-0.jsonl").write_bytes(saved_copy)
+    flush()
+    assert Comment.objects.count() == 1, (
+        "Убедитесь, что повторный разбор очереди не создаёт дубликатов."
+    )
+
+
+@pytest.mark.django_db
+def test_stale_pending_entries_expire(
+    buffering, user_client, post_with_published_location
+):
+    url = f"/posts/{post_with_published_location.pk}/"
+    user_client.post(f"{url}comment/", data={"text": "Из очереди"})
+    with override_settings(COMMENT_PENDING_MAX_AGE=-1):
+        assert "Из очереди" not in user_client.get(url).content.decode()
+    assert not user_client.session.get(comment_queue.SESSION_KEY), (
+        "Убедитесь, что устаревшие записи удаляются из сессии."
+    )
@@ -0,0 +1,96 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from blog import async_views
+from blog.models import CommentActivity
+
+
+@pytest.mark.django_db
+def test_post_detail_not_modified(
+        client, user_client, post_with_published_location
+):
+    url = f"/posts/{post_with_published_location.id}/"
+    etag = client.get(url)["ETag"]
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    assert len(queries) == 1, (
+        "Убедитесь, что для ответа 304 выполняется один запрос "
+        "без загрузки комментариев."
+    )
+    assert user_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200, (
+        "Убедитесь, что ETag зависит от пользователя."
+    )
+
+    user_client.post(f"{url}comment/", data={"text": "Новый комментарий"})
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200, (
+        "Убедитесь, что новый комментарий меняет ETag страницы поста."
+    )
+    assert "Новый комментарий" in response.content.decode()
+
+    comment = post_with_published_location.comments.get()
+    etag = response["ETag"]
+    last_modified = response["Last-Modified"]
+    assert client.get(
+        url, HTTP_IF_MODIFIED_SINCE=last_modified
+    ).status_code == 304
+    post_with_published_location.activity.refresh_from_db()
+    activity_before = post_with_published_location.activity.last_activity_at
+    user_client.post(
+        f"{url}edit_comment/{comment.id}/", data={"text": "Исправлено"}
+    )
+    post_with_published_location.activity.refresh_from_db()
+    assert (
+        post_with_published_location.activity.last_activity_at
+        > activity_before
+    ), "Убедитесь, что правка комментария обновляет активность поста."
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200, (
+        "Убедитесь, что правка комментария меняет ETag страницы поста."
+    )
+
+
+@pytest.mark.django_db
+def test_async_post_detail_not_modified(post_with_published_location):
+    url = f"/posts/{post_with_published_location.id}/"
+    request = RequestFactory().get(url)
+    request.user = post_with_published_location.author
+    response = async_to_sync(async_views.post_detail)(
+        request, post_id=post_with_published_location.id
+    )
+    request = RequestFactory().get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+    request.user = post_with_published_location.author
+    response = async_to_sync(async_views.post_detail)(
+        request, post_id=post_with_published_location.id
+    )
+    assert response.status_code == 304
+
+
+@pytest.mark.django_db
+def test_comment_edit_updates_comment_activity(comment_to_a_post):
+    activity = CommentActivity.objects.get(comment=comment_to_a_post)
+    comment_to_a_post.text = "Исправленный текст"
+    comment_to_a_post.save()
+    activity.refresh_from_db()
+    assert activity.updated_at > comment_to_a_post.created_at, (
+        "Убедитесь, что правка комментария обновляет время его изменения."
+    )
+
+
+@pytest.mark.django_db
+def test_commenter_rename_changes_post_etag(
+        client, another_user, another_user_client, post_with_published_location
+):
+    url = f"/posts/{post_with_published_location.id}/"
+    another_user_client.post(f"{url}comment/", data={"text": "Комментарий"})
+    etag = client.get(url)["ETag"]
+    another_user.username = "renamed_commenter"
+    another_user.save()
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200, (
+        "Убедитесь, что переименование комментатора меняет ETag поста."
+    )
+    assert "@renamed_commenter" in response.content.decode()
@@ -0,0 +1,50 @@
+import pytest
+from django.test import override_settings
+
+from blog.models import Post
+from blogicum import routers
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+def test_reads_go_to_replica_until_write():
+    router = routers.PrimaryReplicaRouter()
+    tokens = routers.start_request(pinned=False)
+    try:
+        assert router.db_for_read(Post) == "replica", (
+            "Убедитесь, что чтение без предшествующей записи идёт с реплики."
+        )
+        assert router.db_for_write(Post) == routers.PRIMARY_DB
+        assert router.db_for_read(Post) == routers.PRIMARY_DB, (
+            "Убедитесь, что после записи чтение идёт с основной базы."
+        )
+        assert routers.has_written()
+    finally:
+        routers.finish_request(tokens)
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+def test_pinned_request_reads_primary():
+    router = routers.PrimaryReplicaRouter()
+    tokens = routers.start_request(pinned=True)
+    try:
+        assert router.db_for_read(Post) == routers.PRIMARY_DB
+    finally:
+        routers.finish_request(tokens)
+
+
+@pytest.mark.django_db
+@override_settings(DATABASE_REPLICAS=["default"])
+def test_pin_cookie_set_after_write(user_client, published_category):
+    response = user_client.post(
+        "/posts/create/",
+        {
+            "title": "Заголовок",
+            "text": "Текст",
+            "category": published_category.id,
+            "pub_date": "2020-01-01T00:00",
+            "is_published": True,
+        },
+    )
+    assert "db_pinned_until" in response.cookies, (
+        "Убедитесь, что после записи клиент закрепляется за основной базой."
+    )
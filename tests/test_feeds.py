@@ -0,0 +1,66 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.fixture
+def published_post(make_published_posts):
+    return make_published_posts(1, title="Публикация для ленты")[0]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url_template", [
+    "/rss/", "/atom/",
+    "/category/{post.category.slug}/rss/",
+    "/category/{post.category.slug}/atom/",
+    "/profile/{post.author.username}/rss/",
+    "/profile/{post.author.username}/atom/",
+])
+def test_feeds_list_published_posts(client, published_post, url_template):
+    response = client.get(url_template.format(post=published_post))
+    assert response.status_code == 200
+    assert published_post.title in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_feed_conditional_get_and_invalidation(client, published_post):
+    response = client.get("/rss/")
+    etag = response["ETag"]
+    assert response["Last-Modified"]
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get("/rss/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    assert not queries, (
+        "Убедитесь, что повторный запрос ленты отдаётся из кэша."
+    )
+    response = client.get(
+        "/rss/", HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+    )
+    assert response.status_code == 304
+
+    published_post.title = "Новый заголовок"
+    published_post.save()
+    response = client.get("/rss/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200, (
+        "Убедитесь, что лента обновляется после изменения публикации."
+    )
+    assert "Новый заголовок" in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_unpublished_category_feed_not_found(
+        client, posts_with_unpublished_category
+):
+    slug = posts_with_unpublished_category[0].category.slug
+    assert client.get(f"/category/{slug}/rss/").status_code == 404
+
+
+@pytest.mark.django_db
+def test_feed_cache_keyed_by_host(client, published_post):
+    client.get("/rss/", HTTP_HOST="localhost")
+    response = client.get("/rss/", HTTP_HOST="127.0.0.1")
+    content = response.content.decode()
+    assert "//127.0.0.1/" in content and "//localhost/" not in content, (
+        "Убедитесь, что лента не отдаёт ссылки с чужого хоста из кэша."
+    )
@@ -0,0 +1,30 @@
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db.models import F
+from django.utils import timezone
+
+from blog.models import Category, Comment, Location, Post
+
+
+@pytest.mark.django_db
+def test_generate_data_creates_requested_amounts():
+    call_command(
+        "generate_data", users=20, categories=3, locations=4, posts=50,
+        comments=200, batch_size=16, seed=1, stdout=StringIO(),
+    )
+    assert get_user_model().objects.count() == 20
+    assert Category.objects.count() == 3
+    assert Location.objects.count() == 4
+    assert Post.objects.count() == 50
+    assert Comment.objects.count() == 200
+    assert not Comment.objects.filter(
+        created_at__lt=F("post__pub_date")
+    ).exists(), (
+        "Убедитесь, что комментарии не появляются раньше публикации."
+    )
+    assert not Comment.objects.filter(
+        post__pub_date__gt=timezone.now()
+    ).exists(), "Убедитесь, что отложенные посты не комментируются."
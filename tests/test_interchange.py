@@ -0,0 +1,46 @@
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+
+from blog.models import Category, Comment, Location, Post
+
+MODELS = (get_user_model(), Category, Location, Post, Comment)
+
+
+def snapshot():
+    return {
+        model: list(model.objects.order_by("pk").values())
+        for model in MODELS
+    }
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("export_format, name", [
+    ("jsonl", "blog.jsonl.gz"),
+    ("csv", "blog-csv"),
+])
+def test_export_import_roundtrip(tmp_path, export_format, name):
+    call_command(
+        "generate_data", users=5, categories=2, locations=2, posts=20,
+        comments=40, seed=3, stdout=StringIO(),
+    )
+    before = snapshot()
+    path = tmp_path / name
+    call_command("export_blog", str(path), format=export_format,
+                 batch_size=7, stderr=StringIO())
+    for model in reversed(MODELS):
+        model.objects.all().delete()
+
+    call_command("import_blog", str(path), batch_size=7, stdout=StringIO())
+    assert snapshot() == before, (
+        "Убедитесь, что после выгрузки и загрузки данные не меняются."
+    )
+    post = Post.objects.create(
+        title="Новый", text="Текст", pub_date=before[Post][0]["pub_date"],
+        author_id=before[Post][0]["author_id"],
+    )
+    assert post.pk > max(row["id"] for row in before[Post]), (
+        "Убедитесь, что после загрузки сбрасываются счётчики ключей."
+    )
@@ -0,0 +1,54 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+
+@pytest.fixture
+def location_posts(make_published_posts, published_location):
+    return make_published_posts(
+        3, location=published_location,
+        pub_date=(timezone.now() + timedelta(days=days)
+                  for days in (-2, -1, 1)),
+    )
+
+
+@pytest.mark.django_db
+def test_location_page_lists_published_posts(
+    client, location_posts, published_location
+):
+    url = f"/location/{published_location.pk}/"
+    response = client.get(url)
+    assert response.status_code == 200
+    assert [post.pk for post in response.context["page_obj"]] == [
+        location_posts[1].pk, location_posts[0].pk
+    ], "Убедитесь, что на странице места только опубликованные посты."
+    with CaptureQueriesContext(connection) as queries:
+        client.get(url)
+    assert not any("COUNT(*)" in query["sql"] for query in queries), (
+        "Убедитесь, что число постов места берётся из кэша."
+    )
+    location_posts[1].delete()
+    assert client.get(url).context["paginator"].count == 1
+
+
+@pytest.mark.django_db
+def test_unpublished_location_is_hidden(client, location_posts,
+                                        published_location):
+    published_location.is_published = False
+    published_location.save()
+    assert client.get(f"/location/{published_location.pk}/").status_code == 404
+    assert client.get(
+        f"/location/{published_location.pk}/rss/"
+    ).status_code == 404
+
+
+@pytest.mark.django_db
+def test_location_feed(client, location_posts, published_location):
+    response = client.get(f"/location/{published_location.pk}/rss/")
+    assert response.status_code == 200
+    content = response.content.decode()
+    assert location_posts[0].title in content
+    assert location_posts[2].title not in content
@@ -0,0 +1,47 @@
+import pytest
+
+from blogicum import metrics
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    metrics.registry.reset()
+    yield
+    metrics.registry.reset()
+
+
+@pytest.mark.django_db
+def test_server_timing_header(client, post_with_published_location):
+    response = client.get("/")
+    assert response.status_code == 200
+    server_timing = response["Server-Timing"]
+    assert "db;dur=" in server_timing and "queries" in server_timing, (
+        "Убедитесь, что ответ содержит заголовок Server-Timing "
+        "с временем и числом SQL-запросов."
+    )
+    assert "tpl;dur=" in server_timing and "total;dur=" in server_timing
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint_aggregates_by_view(
+        client, post_with_published_location
+):
+    client.get("/")
+    client.get(f"/posts/{post_with_published_location.id}/")
+    stats = metrics.registry.snapshot()
+    assert stats["blog:index"][0] == 1
+    assert stats["blog:index"][1] > 0, (
+        "Убедитесь, что SQL-запросы учитываются по имени view."
+    )
+    assert stats["blog:index"][3] > 0, (
+        "Убедитесь, что учитывается время рендеринга шаблонов."
+    )
+    body = client.get("/metrics/").content.decode()
+    assert 'blogicum_requests_total{view="blog:post_detail"} 1' in body
+    assert "blogicum_request_duration_seconds_bucket" in body
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint_hidden_from_outside(client):
+    response = client.get("/metrics/", REMOTE_ADDR="203.0.113.5")
+    assert response.status_code == 404
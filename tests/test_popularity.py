@@ -0,0 +1,83 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.models import Comment, PostScore
+
+
+@pytest.fixture
+def posts(make_published_posts):
+    return make_published_posts(3)
+
+
+def popular_ids(client):
+    response = client.get("/popular/")
+    assert response.status_code == 200
+    return [post.pk for post in response.context["page_obj"]]
+
+
+@pytest.mark.django_db
+def test_popular_ranks_by_comment_activity(client, mixer, user, posts):
+    quiet, busy, silent = posts
+    mixer.blend("blog.Comment", post=quiet, author=user)
+    mixer.cycle(3).blend("blog.Comment", post=busy, author=user)
+    assert popular_ids(client) == [busy.pk, quiet.pk], (
+        "Убедитесь, что популярные посты упорядочены по числу недавних "
+        "комментариев, а посты без комментариев в список не попадают."
+    )
+    Comment.objects.filter(post=busy).delete()
+    assert popular_ids(client) == [quiet.pk]
+    assert not PostScore.objects.filter(post=busy).exists()
+
+
+@pytest.mark.django_db
+def test_old_comments_decay(mixer, user, posts):
+    old, fresh, _ = posts
+    comments = mixer.cycle(4).blend("blog.Comment", post=old, author=user)
+    mixer.blend("blog.Comment", post=fresh, author=user)
+    # Комментарии трёхдневной давности весят по 1/8 свежего.
+    Comment.objects.filter(pk__in=[c.pk for c in comments]).update(
+        created_at=timezone.now() - timedelta(days=3)
+    )
+    call_command("decay_post_scores", rebuild=True, stdout=StringIO())
+    ranking = list(
+        PostScore.objects.order_by("-score").values_list("post_id", flat=True)
+    )
+    assert ranking == [fresh.pk, old.pk]
+
+    Comment.objects.filter(post=old).update(
+        created_at=timezone.now() - timedelta(days=30)
+    )
+    call_command("decay_post_scores", rebuild=True, stdout=StringIO())
+    assert list(PostScore.objects.values_list("post_id", flat=True)) == [
+        fresh.pk
+    ], "Убедитесь, что устаревшие посты убираются из рейтинга."
+
+
+@pytest.mark.django_db
+def test_popular_page_skips_comment_aggregate(client, mixer, user, posts):
+    mixer.blend("blog.Comment", post=posts[0], author=user)
+    with CaptureQueriesContext(connection) as queries:
+        client.get("/popular/")
+    ranking = [
+        query["sql"] for query in queries
+        if '"blog_postscore"' in query["sql"]
+    ]
+    assert ranking and not any(
+        '"blog_comment"' in sql or "GROUP BY" in sql for sql in ranking
+    ), "Убедитесь, что рейтинг читается по индексу без подсчёта комментариев."
+
+
+@pytest.mark.django_db
+def test_popular_context_holds_posts(client, mixer, user, posts):
+    mixer.blend("blog.Comment", post=posts[0], author=user)
+    context = client.get("/popular/").context
+    assert list(context["object_list"]) == list(context["post_list"]) == [
+        posts[0]
+    ], "Убедитесь, что в контексте страницы популярных — посты."
+    assert context["object_list"][0].comment_count == 1
@@ -0,0 +1,48 @@
+import pytest
+from django.core.management import call_command
+from django.test import override_settings
+
+from pages import prerender
+
+
+@pytest.fixture
+def prerendered_dir(tmp_path):
+    with override_settings(PRERENDERED_PAGES_DIR=str(tmp_path),
+                           DEPLOY_VERSION="test"):
+        prerender._pages.clear()
+        call_command("prerender_pages", verbosity=0)
+        yield tmp_path
+    prerender._pages.clear()
+
+
+@pytest.mark.django_db
+def test_static_page_served_prerendered(client, prerendered_dir):
+    response = client.get("/pages/about/")
+    assert response.status_code == 200
+    assert not response.templates, (
+        "Убедитесь, что пререндеренная страница отдаётся без рендеринга."
+    )
+    assert "public" in response["Cache-Control"]
+    not_modified = client.get(
+        "/pages/about/", HTTP_IF_NONE_MATCH=response["ETag"]
+    )
+    assert not_modified.status_code == 304, (
+        "Убедитесь, что при совпадении ETag возвращается 304."
+    )
+
+
+@pytest.mark.django_db
+def test_not_found_page_substitutes_url(client, prerendered_dir):
+    response = client.get("/no-such-page/")
+    assert response.status_code == 404
+    content = response.content.decode()
+    assert prerender.REQUEST_URL_PLACEHOLDER not in content
+    assert "/no-such-page/" in content
+
+
+@pytest.mark.django_db
+def test_logged_in_user_gets_rendered_page(user_client, prerendered_dir):
+    response = user_client.get("/pages/rules/")
+    assert response.status_code == 200
+    assert "pages/rules.html" in [t.name for t in response.templates]
+    assert "private" in response["Cache-Control"]
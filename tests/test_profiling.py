@@ -0,0 +1,37 @@
+import pytest
+from django.conf import settings
+from django.test import override_settings
+
+from blogicum import profiling
+
+
+@pytest.fixture
+def profile_every_request():
+    profiling.profiles.reset()
+    with override_settings(PROFILING={
+        **settings.PROFILING, "ENABLED": True, "SAMPLE_RATE": 1.0,
+        "INTERVAL": 0.0005,
+    }):
+        yield profiling.profiles
+    profiling.profiles.reset()
+
+
+@pytest.mark.django_db
+def test_profiles_collected_and_downloadable_by_staff(
+        client, admin_client, many_posts_with_published_locations,
+        profile_every_request
+):
+    for _ in range(5):
+        client.get("/")
+    collapsed = profile_every_request.collapsed("blog:index")
+    assert collapsed, "Убедитесь, что для view собираются стеки."
+    stack, count = collapsed.splitlines()[0].rsplit(" ", 1)
+    assert int(count) > 0 and ";" in stack
+
+    assert client.get("/admin/profiling/").status_code == 302, (
+        "Убедитесь, что профили доступны только персоналу."
+    )
+    response = admin_client.get("/admin/profiling/blog:index/")
+    assert response.status_code == 200
+    assert response["Content-Disposition"].endswith('.folded"')
+    assert admin_client.get("/admin/profiling/").status_code == 200
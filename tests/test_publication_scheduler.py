@@ -0,0 +1,43 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.cache import get_feed_version
+from blog.management.commands.run_publication_scheduler import WATERMARK_KEY
+from blog.signals import post_published
+
+
+@pytest.mark.django_db
+def test_scheduler_announces_due_posts(mixer, user, published_category):
+    now = timezone.now()
+    due, future = mixer.cycle(2).blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True,
+        pub_date=(date for date in (now - timedelta(seconds=5),
+                                    now + timedelta(days=1))),
+    )
+    announced = []
+
+    def receiver(sender, post, **kwargs):
+        announced.append(post.pk)
+
+    post_published.connect(receiver)
+    try:
+        cache.set(WATERMARK_KEY, now - timedelta(minutes=1), None)
+        version = get_feed_version()
+        call_command("run_publication_scheduler", once=True, stdout=StringIO())
+        assert announced == [due.pk], (
+            "Убедитесь, что сигнал отправляется только для наступивших "
+            "публикаций."
+        )
+        assert get_feed_version() > version
+        call_command("run_publication_scheduler", once=True, stdout=StringIO())
+        assert announced == [due.pk], (
+            "Убедитесь, что публикация объявляется один раз."
+        )
+    finally:
+        post_published.disconnect(receiver)
@@ -0,0 +1,84 @@
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+
+from blog.models import Comment
+from blogicum import ratelimit
+
+
+@pytest.mark.django_db
+@override_settings(RATE_LIMITS={"comment": (2, 60), "post": (2, 60)})
+def test_comment_burst_is_throttled(user_client, another_user_client,
+                                    post_with_published_location):
+    url = f"/posts/{post_with_published_location.pk}/comment/"
+    statuses = [
+        user_client.post(url, data={"text": f"Комментарий {i}"}).status_code
+        for i in range(3)
+    ]
+    assert statuses == [302, 302, 429], (
+        "Убедитесь, что комментарии сверх лимита отклоняются с кодом 429."
+    )
+    assert Comment.objects.count() == 2
+    response = user_client.post(url, data={"text": "Ещё"})
+    assert 0 < int(response["Retry-After"]) <= 30
+    # Лимит по IP общий: у тестового клиента один адрес.
+    assert another_user_client.post(
+        url, data={"text": "С того же адреса"}
+    ).status_code == 429
+
+
+@pytest.mark.django_db
+@override_settings(RATE_LIMITS={"comment": (2, 60), "post": (1, 60)})
+def test_post_create_is_throttled(user_client):
+    assert user_client.get("/posts/create/").status_code == 200
+    user_client.post("/posts/create/", data={})
+    assert user_client.post("/posts/create/", data={}).status_code == 429
+    assert user_client.get("/posts/create/").status_code == 200, (
+        "Убедитесь, что лимит распространяется только на запись."
+    )
+
+
+def test_local_fallback(monkeypatch):
+    def unavailable(*args, **kwargs):
+        raise ConnectionError
+
+    monkeypatch.setattr(cache, "get_many", unavailable)
+    monkeypatch.setattr(cache, "set_many", unavailable)
+    monkeypatch.setattr(ratelimit, "_local", {})
+    keys = ["blogicum:ratelimit:test"]
+    assert ratelimit.take(keys, 1, 60) == 0
+    assert ratelimit.take(keys, 1, 60) > 0, (
+        "Убедитесь, что без кэша лимит считается в памяти процесса."
+    )
+
+
+def test_local_fallback_is_bounded(monkeypatch):
+    def unavailable(*args, **kwargs):
+        raise ConnectionError
+
+    monkeypatch.setattr(cache, "set_many", unavailable)
+    monkeypatch.setattr(ratelimit, "_local", {})
+    monkeypatch.setattr(ratelimit, "LOCAL_MAX_BUCKETS", 2)
+    for i in range(3):
+        ratelimit._store({f"blogicum:ratelimit:{i}": (0, 0)}, 60)
+    assert list(ratelimit._local) == [
+        "blogicum:ratelimit:1", "blogicum:ratelimit:2"
+    ], "Убедитесь, что число вёдер в памяти процесса ограничено."
+
+
+@pytest.mark.django_db
+@override_settings(
+    RATE_LIMITS={"comment": (1, 60), "post": (1, 60)},
+    RATE_LIMIT_IP_HEADER="HTTP_X_FORWARDED_FOR",
+)
+def test_client_ip_from_proxy_header(user_client, another_user_client,
+                                     post_with_published_location):
+    url = f"/posts/{post_with_published_location.pk}/comment/"
+    assert user_client.post(
+        url, data={"text": "Первый"}, HTTP_X_FORWARDED_FOR="198.51.100.1"
+    ).status_code == 302
+    assert another_user_client.post(
+        url, data={"text": "Второй"}, HTTP_X_FORWARDED_FOR="198.51.100.2"
+    ).status_code == 302, (
+        "Убедитесь, что за прокси лимит по IP считается по адресу клиента."
+    )
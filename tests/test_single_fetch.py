@@ -0,0 +1,48 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def blog_queries(queries):
+    return [
+        query["sql"] for query in queries
+        if "blog_post" in query["sql"] or "blog_comment" in query["sql"]
+    ]
+
+
+@pytest.fixture
+def own_comment(mixer, user, post_with_published_location):
+    return mixer.blend(
+        "blog.Comment", post=post_with_published_location, author=user
+    )
+
+
+@pytest.mark.django_db
+def test_edit_views_fetch_object_once(
+        user_client, post_with_published_location, own_comment
+):
+    post_id = post_with_published_location.id
+    for url in (
+        f"/posts/{post_id}/edit/",
+        f"/posts/{post_id}/delete/",
+        f"/posts/{post_id}/edit_comment/{own_comment.id}/",
+        f"/posts/{post_id}/delete_comment/{own_comment.id}/",
+    ):
+        with CaptureQueriesContext(connection) as queries:
+            assert user_client.get(url).status_code == 200
+        assert len(blog_queries(queries)) == 1, (
+            f"Убедитесь, что `{url}` загружает объект одним запросом."
+        )
+
+
+@pytest.mark.django_db
+def test_comment_lookup_scoped_by_post(
+        user_client, own_comment, post_of_another_author
+):
+    url = (
+        f"/posts/{post_of_another_author.id}/edit_comment/"
+        f"{own_comment.id}/"
+    )
+    assert user_client.get(url).status_code == 404, (
+        "Убедитесь, что комментарий ищется только среди комментариев поста."
+    )
@@ -0,0 +1,34 @@
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db
+@override_settings(SITEMAP_SEGMENT_SIZE=2)
+def test_sitemap_segments(client, published_posts):
+    index = client.get("/sitemap.xml").content.decode()
+    last = published_posts[-1]
+    segment_url = f"/sitemap-posts-{(last.pk - 1) // 2 + 1}.xml"
+    assert f"http://testserver{segment_url}" in index
+
+    content = client.get(segment_url).content.decode()
+    assert f"http://testserver/posts/{last.pk}/" in content
+    assert "<lastmod>" in content
+    assert f"/posts/{published_posts[0].pk}/" not in content, (
+        "Убедитесь, что сегмент содержит только свой диапазон ключей."
+    )
+    with CaptureQueriesContext(connection) as queries:
+        client.get(segment_url)
+    assert len(queries) == 1, (
+        "Убедитесь, что собранный сегмент отдаётся из кэша."
+    )
+
+    last.is_published = False
+    last.save()
+    content = client.get(segment_url).content.decode()
+    assert f"/posts/{last.pk}/" not in content, (
+        "Убедитесь, что сегмент пересобирается при изменении публикации."
+    )
+    assert client.get("/sitemap-posts-1000.xml").status_code == 404
+    assert client.get("/sitemap-unknown-1.xml").status_code == 404
@@ -0,0 +1,47 @@
+import pytest
+from django.conf import settings
+from django.test import override_settings
+
+from blogicum import slow_queries
+
+
+@pytest.fixture
+def log_every_query():
+    slow_queries.slow_log.reset()
+    with override_settings(
+        SLOW_QUERY_LOG={**settings.SLOW_QUERY_LOG, "THRESHOLD_MS": 0}
+    ):
+        yield slow_queries.slow_log
+    slow_queries.slow_log.reset()
+
+
+def test_fingerprint_ignores_literals():
+    first, _ = slow_queries.fingerprint(
+        "SELECT * FROM blog_post WHERE id IN (1, 2, 3) AND title = 'a'"
+    )
+    second, normalized = slow_queries.fingerprint(
+        "SELECT *  FROM blog_post WHERE id IN (%s, %s) AND title = 'b'"
+    )
+    assert first == second
+    assert normalized == (
+        "SELECT * FROM blog_post WHERE id IN (...) AND title = ?"
+    )
+
+
+@pytest.mark.django_db
+def test_slow_queries_logged_with_view_and_plan(
+        client, post_with_published_location, log_every_query
+):
+    client.get("/")
+    feed_queries = [
+        stats for _, stats in log_every_query.snapshot()
+        if "blog:index" in stats.views and "blog_post" in stats.normalized
+    ]
+    assert feed_queries, (
+        "Убедитесь, что медленные запросы связываются с вызвавшей их view."
+    )
+    assert any(stats.plan for stats in feed_queries), (
+        "Убедитесь, что для медленного запроса сохраняется план выполнения."
+    )
+    report = client.get("/metrics/slow-queries/").content.decode()
+    assert "blog:index" in report
@@ -0,0 +1,46 @@
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+
+from blogicum.middleware import StaticFilesMiddleware, accepted_encodings
+
+
+def test_collectstatic_hashes_and_compresses(tmp_path):
+    with override_settings(
+        STATIC_ROOT=tmp_path,
+        STATICFILES_STORAGE=(
+            "blogicum.storage.CompressedManifestStaticFilesStorage"
+        ),
+    ):
+        call_command("collectstatic", interactive=False, verbosity=0)
+        hashed_css = next((tmp_path / "css").glob("bootstrap.min.*.css"))
+        assert (hashed_css.parent / (hashed_css.name + ".gz")).is_file(), (
+            "Убедитесь, что для CSS сохраняется сжатая gzip-копия."
+        )
+
+        middleware = StaticFilesMiddleware(lambda request: HttpResponse())
+        request = RequestFactory().get(
+            f"/static/css/{hashed_css.name}", HTTP_ACCEPT_ENCODING="gzip"
+        )
+        response = middleware(request)
+        assert response["Content-Encoding"] == "gzip"
+        assert response["Content-Type"] == "text/css"
+        assert "immutable" in response["Cache-Control"], (
+            "Убедитесь, что файлы с хэшем в имени кэшируются навсегда."
+        )
+        assert not response.has_header("Content-Disposition")
+
+        request = RequestFactory().get(
+            f"/static/css/{hashed_css.name}",
+            HTTP_ACCEPT_ENCODING="gzip;q=0, identity",
+        )
+        assert not middleware(request).has_header("Content-Encoding"), (
+            "Убедитесь, что кодировка с q=0 не выбирается."
+        )
+
+
+def test_accepted_encodings_respect_q_values():
+    codings = {"br", "gzip"}
+    assert accepted_encodings("gzip, br;q=0", codings) == {"gzip"}
+    assert accepted_encodings("*;q=0.5, gzip;q=0", codings) == {"br"}
+    assert accepted_encodings("identity", codings) == set()
@@ -0,0 +1,41 @@
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Post
+from blog.views import get_published_posts
+
+
+def visible_count():
+    return Post.objects.filter(is_visible=True).count()
+
+
+@pytest.mark.django_db
+@override_settings(VISIBILITY_CHUNK_SIZE=2)
+def test_category_flag_updates_posts(published_posts, published_category):
+    assert visible_count() == 5
+    published_category.is_published = False
+    published_category.save()
+    assert visible_count() == 0, (
+        "Убедитесь, что снятие категории с публикации скрывает её посты."
+    )
+    published_posts[0].is_published = False
+    published_posts[0].save()
+    published_category.is_published = True
+    published_category.save()
+    assert visible_count() == 4, (
+        "Убедитесь, что после возврата категории скрытые посты остаются "
+        "скрытыми."
+    )
+    published_category.delete()
+    assert visible_count() == 0
+
+
+@pytest.mark.django_db
+def test_published_posts_skip_category_filter(published_posts):
+    with CaptureQueriesContext(connection) as queries:
+        list(get_published_posts(Post.objects).values_list("pk"))
+    assert '"blog_category"."is_published"' not in queries[0]["sql"], (
+        "Убедитесь, что лента фильтрует по Post.is_visible без категории."
+    )